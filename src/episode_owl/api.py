@@ -1,12 +1,122 @@
 """TVMaze API client for fetching show and episode data."""
 
+import logging
+import random
+import sqlite3
+import threading
 import time
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
 import requests
+from requests.adapters import HTTPAdapter
 
+from . import jsonio
+from .api_cache import ResponseCache
+
+
+logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.tvmaze.com"
-RATE_LIMIT_DELAY = 0.5  # seconds between requests
+
+# Endpoint URLs; the formatted URL is also the response cache key
+_EP_SEARCH = BASE_URL + "/search/shows"
+_EP_SHOW = BASE_URL + "/shows/{}"
+_EP_SHOW_EPISODES = BASE_URL + "/shows/{}/episodes"
+
+# Episode fields the tracker reads; everything else (summary HTML, images,
+# links) is dropped right after decoding so it isn't kept or cached
+EPISODE_FIELDS = ("id", "season", "number", "name", "airdate", "type")
+
+# TVMaze allows bursts of 20 requests per 10 seconds
+RATE_LIMIT_BURST = 20
+RATE_LIMIT_PER_SECOND = 2.0
+
+# Retry tuning for failed episode fetches
+BACKOFF_CAP = 8.0  # seconds
+NON_RETRYABLE_STATUSES = {400, 401, 403, 404}
+
+# Shared session so repeated calls to api.tvmaze.com reuse a keep-alive
+# connection instead of paying a new TCP/TLS handshake per request
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "User-Agent": "episode-owl/1.0",
+    "Accept": "application/json",
+})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0))
+
+# Conditional-request cache for episode/show lookups (see enable_cache)
+_CACHE: Optional[ResponseCache] = None
+
+# Requests currently being fetched, so duplicates can wait on one result
+_INFLIGHT: dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# Short-lived in-process memo of search responses: {query: (timestamp, body)}.
+# Bodies are kept undecoded so every hit returns fresh result objects
+SEARCH_CACHE_TTL = 60  # seconds
+SEARCH_CACHE_SIZE = 32
+_SEARCH_CACHE: dict[str, tuple[float, bytes]] = {}
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Allows bursts of up to ``capacity`` requests, then throttles callers
+    to ``refill_rate`` requests per second.
+
+    Attributes:
+        capacity: Maximum number of tokens (burst size)
+        refill_rate: Tokens added per second
+    """
+
+    def __init__(self, capacity: int = RATE_LIMIT_BURST, refill_rate: float = RATE_LIMIT_PER_SECOND):
+        """Initialize a full bucket.
+
+        Args:
+            capacity: Maximum number of tokens (burst size)
+            refill_rate: Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+            self._last_refill = now
+
+            if self._tokens < 1:
+                # Sleep while holding the lock so waiting callers queue in order
+                time.sleep((1 - self._tokens) / self.refill_rate)
+                self._tokens = 0.0
+                self._last_refill = time.monotonic()
+            else:
+                self._tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Block all callers for the given time, then allow one request.
+
+        Used when the server reports rate limiting, so that no other
+        request is sent until the requested delay has passed and traffic
+        resumes one request at a time.
+
+        Args:
+            seconds: Time to wait
+        """
+        with self._lock:
+            time.sleep(seconds)
+            self._tokens = 1.0
+            self._last_refill = time.monotonic()
+
+
+# Shared by every request (including concurrent fetch workers)
+_BUCKET = TokenBucket()
 
 
 class TVMazeAPIError(Exception):
@@ -19,12 +129,154 @@ class NetworkError(Exception):
     pass
 
 
-def search_shows(query: str, timeout: int = 10) -> list[dict]:
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a JSON response body.
+
+    Args:
+        response: HTTP response
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    return jsonio.loads(response.content)
+
+
+def enable_cache(db_path: Path) -> None:
+    """Enable the on-disk response cache for episode and show lookups.
+
+    The cache is only an optimization: if the database can't be opened
+    (corrupt, locked, unwritable directory), a warning is logged and
+    requests go out uncached.
+
+    Args:
+        db_path: Path to the SQLite cache database
+    """
+    global _CACHE
+
+    try:
+        _CACHE = ResponseCache(db_path)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not open response cache {db_path}, continuing without it: {e}")
+
+
+def close() -> None:
+    """Release pooled connections and close the response cache.
+
+    Call once when the application is done making requests.
+    """
+    global _CACHE
+
+    _SESSION.close()
+
+    if _CACHE is not None:
+        _CACHE.close()
+        _CACHE = None
+
+
+def _cached_get(url: str, timeout: int) -> tuple[requests.Response, Any]:
+    """Send a GET request, revalidating any cached copy of the resource.
+
+    Args:
+        url: Request URL
+        timeout: Request timeout in seconds
+
+    Returns:
+        Tuple of (response, cached_data). cached_data is the previously
+        stored body when the server answered 304 Not Modified, else None.
+    """
+    cached = _CACHE.get(url) if _CACHE else None
+
+    headers = {}
+    if cached:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    _BUCKET.acquire()
+    response = _SESSION.get(url, timeout=timeout, headers=headers)
+
+    if cached and response.status_code == 304:
+        _CACHE.touch(url)
+        return response, cached.data
+
+    return response, None
+
+
+def _cache_response(url: str, response: requests.Response, data: Any) -> None:
+    """Store a successful response so later requests can be conditional.
+
+    Args:
+        url: Request URL
+        response: Response the data was decoded from
+        data: Decoded JSON body
+    """
+    if _CACHE is None:
+        return
+
+    # Stored even without validators: the fetch time alone lets callers
+    # skip the request while the entry is fresh (see get_show_episodes)
+    _CACHE.put(
+        url,
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+        data
+    )
+
+
+def _fresh_cached(url: str, max_age: float) -> Any:
+    """Look up a cached response that is young enough to use without a request.
+
+    Args:
+        url: Request URL
+        max_age: Maximum age of the cached entry in seconds
+
+    Returns:
+        Cached data, or None if there is no entry younger than max_age
+    """
+    if _CACHE is None or max_age <= 0:
+        return None
+
+    cached = _CACHE.get(url)
+    if cached and time.time() - cached.fetched_at < max_age:
+        return cached.data
+
+    return None
+
+
+def _remember_search(query: str, body: bytes) -> None:
+    """Memoize a search response, evicting expired and excess entries.
+
+    Entries are kept in insertion order, so the oldest are always first.
+
+    Args:
+        query: Search term
+        body: Raw JSON response body
+    """
+    now = time.monotonic()
+
+    _SEARCH_CACHE.pop(query, None)
+
+    while _SEARCH_CACHE:
+        oldest = next(iter(_SEARCH_CACHE))
+        fresh = now - _SEARCH_CACHE[oldest][0] < SEARCH_CACHE_TTL
+        if fresh and len(_SEARCH_CACHE) < SEARCH_CACHE_SIZE:
+            break
+        del _SEARCH_CACHE[oldest]
+
+    _SEARCH_CACHE[query] = (now, body)
+
+
+def search_shows(query: str, timeout: int = 10, max_results: int = 25) -> list[dict]:
     """Search for shows on TVMaze.
 
     Args:
         query: Search term
         timeout: Request timeout in seconds
+        max_results: Maximum number of results to return (API relevance order)
 
     Returns:
         List of show dictionaries from API
@@ -33,13 +285,20 @@ def search_shows(query: str, timeout: int = 10) -> list[dict]:
         NetworkError: If network request fails
         TVMazeAPIError: If API returns an error
     """
-    url = f"{BASE_URL}/search/shows"
+    cached = _SEARCH_CACHE.get(query)
+    if cached and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+        return jsonio.loads(cached[1])[:max_results]
+
+    url = _EP_SEARCH
     params = {"q": query}
 
     try:
-        response = requests.get(url, params=params, timeout=timeout)
+        _BUCKET.acquire()
+        response = _SESSION.get(url, params=params, timeout=timeout)
         response.raise_for_status()
-        return response.json()
+        results = _decode_json(response)
+        _remember_search(query, response.content)
+        return results[:max_results]
     except requests.Timeout:
         raise NetworkError(f"Request timed out after {timeout} seconds")
     except requests.RequestException as e:
@@ -48,13 +307,102 @@ def search_shows(query: str, timeout: int = 10) -> list[dict]:
         raise TVMazeAPIError(f"Invalid JSON response: {e}")
 
 
-def get_show_episodes(show_id: int, timeout: int = 10, retry_attempts: int = 1) -> list[dict]:
+def _slim_episodes(episodes: list[dict]) -> list[dict]:
+    """Reduce API episode records to the fields the tracker uses.
+
+    Args:
+        episodes: Episode dictionaries from API
+
+    Returns:
+        New list of episode dictionaries containing only EPISODE_FIELDS
+    """
+    return [
+        {field: episode[field] for field in EPISODE_FIELDS if field in episode}
+        for episode in episodes
+    ]
+
+
+def _coalesce(key: str, fetch: Callable[[], Any]) -> Any:
+    """Run fetch, sharing its result with concurrent calls for the same key.
+
+    If another thread is already fetching the same key, wait for its
+    result (or exception) instead of issuing a duplicate request.
+
+    Args:
+        key: Request identity, normally the URL
+        fetch: Function performing the request
+
+    Returns:
+        Result of fetch
+    """
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _INFLIGHT[key] = future
+
+    if not is_owner:
+        return future.result()
+
+    try:
+        result = fetch()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Get a jittered, capped exponential backoff delay.
+
+    Random jitter keeps concurrent fetches that failed together from
+    retrying in lockstep.
+
+    Args:
+        attempt: Zero-based attempt number that just failed
+
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    return min(BACKOFF_CAP, random.uniform(0.5, 2 ** (attempt + 1)))
+
+
+def _retry_after(response: requests.Response, default: float) -> float:
+    """Read the Retry-After header of a rate-limited response.
+
+    Args:
+        response: 429 response from API
+        default: Delay to use if the header is missing or not in seconds
+
+    Returns:
+        Seconds to wait before retrying
+    """
+    try:
+        return float(response.headers.get("Retry-After", default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_show_episodes(
+    show_id: int,
+    timeout: int = 10,
+    retry_attempts: int = 1,
+    max_age: float = 0
+) -> list[dict]:
     """Get all episodes for a show.
 
     Args:
         show_id: TVMaze show ID
         timeout: Request timeout in seconds
         retry_attempts: Number of retry attempts on failure
+        max_age: If the response cache holds an entry younger than this many
+            seconds, return it without any request (0 always revalidates)
 
     Returns:
         List of episode dictionaries from API
@@ -63,36 +411,71 @@ def get_show_episodes(show_id: int, timeout: int = 10, retry_attempts: int = 1)
         NetworkError: If network request fails after retries
         TVMazeAPIError: If API returns an error
     """
-    url = f"{BASE_URL}/shows/{show_id}/episodes"
+    url = _EP_SHOW_EPISODES.format(show_id)
+
+    cached_episodes = _fresh_cached(url, max_age)
+    if cached_episodes is not None:
+        return cached_episodes
+
+    return _coalesce(url, lambda: _fetch_episodes(url, timeout, retry_attempts))
+
 
+def _fetch_episodes(url: str, timeout: int, retry_attempts: int) -> list[dict]:
+    """Fetch an episode list with retries (see get_show_episodes).
+
+    Args:
+        url: Episode list URL
+        timeout: Request timeout in seconds
+        retry_attempts: Number of retry attempts on failure
+
+    Returns:
+        List of episode dictionaries from API
+
+    Raises:
+        NetworkError: If network request fails after retries
+        TVMazeAPIError: If API returns an error
+    """
     last_error = None
     for attempt in range(retry_attempts + 1):
         try:
-            response = requests.get(url, timeout=timeout)
+            response, cached_episodes = _cached_get(url, timeout)
+
+            # Unchanged since last fetch - reuse the stored episode list
+            if cached_episodes is not None:
+                return cached_episodes
 
             # Handle 404 gracefully - show might not have episodes yet
             if response.status_code == 404:
                 return []
 
             response.raise_for_status()
-            episodes = response.json()
-
-            # Add small delay to respect rate limits
-            time.sleep(RATE_LIMIT_DELAY)
+            episodes = _slim_episodes(_decode_json(response))
+            _cache_response(url, response, episodes)
 
             return episodes
 
         except requests.Timeout:
             last_error = NetworkError(f"Request timed out after {timeout} seconds")
             if attempt < retry_attempts:
-                # Exponential backoff: 2s, 4s, 8s...
-                wait_time = 2 ** (attempt + 1)
-                time.sleep(wait_time)
+                time.sleep(_backoff_delay(attempt))
         except requests.RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+
+            # Client errors won't succeed on retry
+            if status in NON_RETRYABLE_STATUSES:
+                raise TVMazeAPIError(f"HTTP {status}: {e}")
+
             last_error = NetworkError(f"Network error: {e}")
             if attempt < retry_attempts:
-                wait_time = 2 ** (attempt + 1)
-                time.sleep(wait_time)
+                wait_time = _backoff_delay(attempt)
+
+                if status == 429:
+                    # Rate limited: honor Retry-After and hold back every
+                    # other request until the server is ready again
+                    wait_time = _retry_after(e.response, wait_time)
+                    _BUCKET.pause(wait_time)
+                else:
+                    time.sleep(wait_time)
         except ValueError as e:
             raise TVMazeAPIError(f"Invalid JSON response: {e}")
 
@@ -103,6 +486,58 @@ def get_show_episodes(show_id: int, timeout: int = 10, retry_attempts: int = 1)
     return []
 
 
+def iter_fetched_episodes(
+    show_ids: list[int],
+    concurrency: int = 4,
+    timeout: int = 10,
+    retry_attempts: int = 1,
+    max_ages: Optional[dict[int, float]] = None
+) -> Iterator[tuple[int, list[dict] | Exception]]:
+    """Fetch episodes for several shows concurrently, yielding as each completes.
+
+    Callers can process one show's episodes while the remaining requests
+    are still in flight.
+
+    Args:
+        show_ids: TVMaze show IDs to fetch
+        concurrency: Maximum number of requests in flight at once
+        timeout: Request timeout in seconds
+        retry_attempts: Number of retry attempts on failure
+        max_ages: Per-show max_age for get_show_episodes (shows not listed
+            are always revalidated)
+
+    Yields:
+        (show_id, result) pairs in completion order, where result is the
+        episode list or the NetworkError/TVMazeAPIError raised fetching it
+    """
+    if not show_ids:
+        return
+
+    # Each show only needs fetching once, even if listed more than once
+    unique_ids = list(dict.fromkeys(show_ids))
+    workers = max(1, min(concurrency, len(unique_ids)))
+    max_ages = max_ages or {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                get_show_episodes,
+                show_id,
+                timeout,
+                retry_attempts,
+                max_ages.get(show_id, 0)
+            ): show_id
+            for show_id in unique_ids
+        }
+
+        for future in as_completed(futures):
+            show_id = futures[future]
+            try:
+                yield show_id, future.result()
+            except (NetworkError, TVMazeAPIError) as e:
+                yield show_id, e
+
+
 def get_show_by_id(show_id: int, timeout: int = 10) -> Optional[dict]:
     """Get show information by ID.
 
@@ -117,16 +552,21 @@ def get_show_by_id(show_id: int, timeout: int = 10) -> Optional[dict]:
         NetworkError: If network request fails
         TVMazeAPIError: If API returns an error
     """
-    url = f"{BASE_URL}/shows/{show_id}"
+    url = _EP_SHOW.format(show_id)
 
     try:
-        response = requests.get(url, timeout=timeout)
+        response, cached_show = _cached_get(url, timeout)
+
+        if cached_show is not None:
+            return cached_show
 
         if response.status_code == 404:
             return None
 
         response.raise_for_status()
-        return response.json()
+        show = _decode_json(response)
+        _cache_response(url, response, show)
+        return show
 
     except requests.Timeout:
         raise NetworkError(f"Request timed out after {timeout} seconds")
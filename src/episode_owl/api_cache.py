@@ -0,0 +1,155 @@
+"""On-disk cache of TVMaze responses for conditional requests."""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from . import jsonio
+
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    """A cached API response.
+
+    Attributes:
+        etag: ETag header returned with the response (if any)
+        last_modified: Last-Modified header returned with the response (if any)
+        data: Decoded JSON body
+        fetched_at: Unix time the response was last fetched or revalidated
+    """
+    etag: str | None
+    last_modified: str | None
+    data: Any
+    fetched_at: float = 0.0
+
+
+class ResponseCache:
+    """SQLite-backed cache of decoded API responses keyed by URL.
+
+    Entries store the validators (ETag/Last-Modified) needed to send a
+    conditional request, so an unchanged resource costs a 304 with an
+    empty body instead of a full download and parse.
+
+    Attributes:
+        db_path: Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: Path):
+        """Initialize the cache, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+
+        Raises:
+            sqlite3.Error: If the database can't be opened, e.g. because the
+                file is corrupt or locked
+            OSError: If the cache directory can't be created
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Shared across the fetch worker threads; access is serialized by _lock
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        try:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT, "
+                "fetched_at REAL NOT NULL DEFAULT 0)"
+            )
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Look up a cached response.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            CachedResponse or None if the URL is not cached
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT etag, last_modified, body, fetched_at FROM responses "
+                    "WHERE url = ?",
+                    (url,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read response cache: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        etag, last_modified, body, fetched_at = row
+
+        try:
+            data = jsonio.loads(body)
+        except ValueError:
+            return None
+
+        return CachedResponse(
+            etag=etag,
+            last_modified=last_modified,
+            data=data,
+            fetched_at=fetched_at
+        )
+
+    def put(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        data: Any
+    ) -> None:
+        """Store a response in the cache.
+
+        Args:
+            url: Request URL
+            etag: ETag header value
+            last_modified: Last-Modified header value
+            data: Decoded JSON body
+        """
+        body = jsonio.dumps(data).decode("utf-8")
+
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(url, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    (url, etag, last_modified, body, time.time())
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write response cache: {e}")
+
+    def touch(self, url: str) -> None:
+        """Mark a cached response as fresh after the server confirmed it unchanged.
+
+        Args:
+            url: Request URL
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE responses SET fetched_at = ? WHERE url = ?",
+                    (time.time(), url)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write response cache: {e}")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,25 +1,46 @@
 """Command-line interface for Episode Owl."""
 
+import argparse
 import sys
+from datetime import datetime
 from pathlib import Path
+from typing import Mapping
 
-from . import api, config, notifications, notifier, search, storage, tracker, utils, watched
+# api, search and notifier pull in requests/rapidfuzz/notification backends,
+# so they're imported only by the commands that use them
+from . import config, notifications, storage, tracker, utils, watched
+
+
+# Pre-joined so each is emitted with a single write
+_HEADER = "\n" + "="*60 + "\n  Episode Owl - TV Show & Anime Tracker\n" + "="*60 + "\n\n"
+_MENU = _HEADER + "\n".join([
+    "1. Add show",
+    "2. Remove show",
+    "3. Check for updates",
+    "4. List tracked shows",
+    "5. View timeline",
+    "6. Mark as watched",
+    "7. Exit",
+    "",
+    "",
+])
 
 
 def print_header():
     """Print the application header."""
-    print("\n" + "="*60)
-    print("  Episode Owl - TV Show & Anime Tracker")
-    print("="*60 + "\n")
+    sys.stdout.write(_HEADER)
+    sys.stdout.flush()
 
 
-def add_show_interactive(paths: dict[str, Path], cfg: config.Config) -> None:
+def add_show_interactive(paths: Mapping[str, Path], cfg: config.Config) -> None:
     """Add a show through interactive search.
 
     Args:
         paths: Dictionary of file paths
         cfg: Configuration object
     """
+    from . import api, search
+
     query = input("Enter show name to search: ").strip()
 
     if not query:
@@ -30,7 +51,11 @@ def add_show_interactive(paths: dict[str, Path], cfg: config.Config) -> None:
 
     try:
         # Search TVMaze API
-        results = api.search_shows(query, timeout=cfg.api_timeout)
+        results = api.search_shows(
+            query,
+            timeout=cfg.api_timeout,
+            max_results=cfg.search_result_limit or 15
+        )
 
         if not results:
             print("No shows found. Try a different search term.")
@@ -65,18 +90,15 @@ def add_show_interactive(paths: dict[str, Path], cfg: config.Config) -> None:
             retry_attempts=cfg.retry_attempts
         )
 
-        # Parse and filter episodes
-        episodes = [tracker.parse_episode_from_api(ep) for ep in episodes_data]
-        aired_episodes = tracker.filter_aired_episodes(episodes, cfg.include_specials)
-
-        # Get latest episode for initial state
-        latest = tracker.get_latest_episode(aired_episodes)
+        # Get latest aired episode for initial state
+        latest = tracker.find_latest_aired_episode(episodes_data, cfg.include_specials)
 
         # Create show dictionary
         show_dict = tracker.create_show_dict(
             selected.show_id,
             selected.name,
-            latest
+            latest,
+            selected.status
         )
 
         # Save to storage
@@ -98,7 +120,7 @@ def add_show_interactive(paths: dict[str, Path], cfg: config.Config) -> None:
         print(f"\nStorage error: {e}")
 
 
-def remove_show_interactive(paths: dict[str, Path]) -> None:
+def remove_show_interactive(paths: Mapping[str, Path]) -> None:
     """Remove a show through interactive selection.
 
     Args:
@@ -141,78 +163,162 @@ def remove_show_interactive(paths: dict[str, Path]) -> None:
         print(f"\nStorage error: {e}")
 
 
-def check_updates(paths: dict[str, Path], cfg: config.Config, no_open: bool = False) -> None:
+def _check_show(
+    show: dict,
+    episodes_data: list[dict] | Exception,
+    cfg: config.Config,
+    now: datetime
+) -> tuple[str, list[tracker.ShowUpdate], dict | None]:
+    """Find new episodes for one show from its fetched episode list.
+
+    Args:
+        show: Show dictionary
+        episodes_data: Raw episodes from the API, or the error raised fetching them
+        cfg: Configuration object
+        now: Time of the check, shared by every show in the run
+
+    Returns:
+        Tuple of (progress line, new episode updates, updated show). The
+        updated show is the original dict if nothing changed, or None if
+        the fetch failed.
+    """
+    show_name = show["name"]
+    show_id = show["id"]
+
+    if isinstance(episodes_data, Exception):
+        return f"  {show_name}: Error - {episodes_data}", [], None
+
+    today = now.date().isoformat()
+
+    # Find new aired episodes (scans only the unseen tail of the list)
+    new_episodes = list(tracker.iter_new_episodes(
+        episodes_data,
+        (show.get("last_seen_season"), show.get("last_seen_episode", 0)),
+        cfg.include_specials,
+        today
+    ))
+    new_episodes.reverse()
+    next_airdate = tracker.find_next_airdate(episodes_data, today)
+
+    if not new_episodes:
+        updated_show = show
+        if show.get("next_airdate") != next_airdate or show.get("force_check"):
+            updated_show = tracker.record_next_airdate(show, next_airdate)
+
+        # Lets later runs skip the show until it's due for a recheck
+        if show.get("status") == "Ended":
+            updated_show = tracker.mark_no_new_episodes(updated_show, today)
+
+        return f"  {show_name}: No new episodes", [], updated_show
+
+    updates = [
+        tracker.ShowUpdate(show_id=show_id, show_name=show_name, episode=episode)
+        for episode in new_episodes
+    ]
+
+    # Update show state to latest episode
+    updated_show = tracker.update_show_state(
+        show, new_episodes[-1], next_airdate, now.isoformat()
+    )
+
+    return f"✓ {show_name}: {len(new_episodes)} new episode(s)", updates, updated_show
+
+
+def check_updates(
+    paths: Mapping[str, Path],
+    cfg: config.Config,
+    no_open: bool = False,
+    force: bool = False
+) -> None:
     """Check for new episodes for all tracked shows.
 
+    Shows whose next episode is scheduled after today, and ended shows
+    recently found to have nothing new, are skipped without an API call
+    unless force is set.
+
     Args:
         paths: Dictionary of file paths
         cfg: Configuration object
         no_open: If True, don't auto-open timeline (overrides config)
+        force: If True, check every show regardless of its next airdate
     """
+    from . import api, notifier
+
     try:
-        shows = storage.load_shows(paths["shows"])
+        # Show state changes are written once, when the store closes
+        with storage.ShowStore(paths["shows"]) as store:
+            shows = store.shows
 
-        if not shows:
-            print("No shows are currently being tracked.")
-            print("Add shows first using the 'Add show' option.")
-            return
+            if not shows:
+                print("No shows are currently being tracked.")
+                print("Add shows first using the 'Add show' option.")
+                return
+
+            print(f"Checking {len(shows)} show(s) for updates...\n")
 
-        print(f"Checking {len(shows)} show(s) for updates...\n")
-
-        all_updates = []
-        errors = []
-
-        for show in shows:
-            show_name = show["name"]
-            show_id = show["id"]
-            last_season = show.get("last_seen_season")
-            last_episode = show.get("last_seen_episode", 0)
-
-            try:
-                # Fetch episodes from API
-                episodes_data = api.get_show_episodes(
-                    show_id,
-                    timeout=cfg.api_timeout,
-                    retry_attempts=cfg.retry_attempts
-                )
-
-                # Parse and filter episodes
-                episodes = [tracker.parse_episode_from_api(ep) for ep in episodes_data]
-                aired_episodes = tracker.filter_aired_episodes(episodes, cfg.include_specials)
-
-                # Find new episodes
-                new_episodes = tracker.find_new_episodes(
-                    aired_episodes,
-                    (last_season, last_episode)
-                )
-
-                if new_episodes:
-                    print(f"✓ {show_name}: {len(new_episodes)} new episode(s)")
-
-                    # Create updates for each new episode
-                    for episode in new_episodes:
-                        update = tracker.ShowUpdate(
-                            show_id=show_id,
-                            show_name=show_name,
-                            episode=episode
+            # One timestamp for the whole run instead of one per show
+            now = datetime.now()
+
+            all_updates = []
+            errors = []
+            progress = []
+
+            # Nothing can have aired for shows whose next episode is still ahead
+            # or that ended and were recently confirmed to have nothing new
+            if force:
+                due_shows = shows
+            else:
+                due_shows = []
+                for show in shows:
+                    if not tracker.should_skip_check(
+                        show,
+                        today=now.date().isoformat(),
+                        ended_recheck_days=cfg.ended_recheck_days
+                    ):
+                        due_shows.append(show)
+                    elif show.get("status") == "Ended":
+                        progress.append(f"  {show['name']}: Ended, skipped")
+                    else:
+                        progress.append(
+                            f"  {show['name']}: Next episode {show['next_airdate']}, skipped"
                         )
-                        all_updates.append(update)
-
-                    # Update show state to latest episode
-                    latest = new_episodes[-1]
-                    storage.update_show(
-                        show_id,
-                        tracker.update_show_state(show, latest),
-                        paths["shows"]
-                    )
-                else:
-                    print(f"  {show_name}: No new episodes")
 
-            except (api.NetworkError, api.TVMazeAPIError) as e:
-                error_msg = f"  {show_name}: Error - {e}"
-                print(error_msg)
-                errors.append(error_msg)
-                continue
+            # Ended shows rarely change, so a recently fetched list is reused as is
+            ended_ttl = cfg.ended_show_ttl_days * 86400
+            max_ages = {
+                show["id"]: ended_ttl
+                for show in due_shows
+                if show.get("status") == "Ended" and not force
+            }
+
+            # Process each show as soon as its fetch completes, while the rest
+            # are still in flight; results are reported in tracked order below
+            results = {}
+            for show_id, episodes_data in api.iter_fetched_episodes(
+                [show["id"] for show in due_shows],
+                concurrency=cfg.api_concurrency,
+                timeout=cfg.api_timeout,
+                retry_attempts=cfg.retry_attempts,
+                max_ages=max_ages
+            ):
+                results[show_id] = _check_show(store.get(show_id), episodes_data, cfg, now)
+
+            for show in due_shows:
+                progress_line, updates, updated_show = results[show["id"]]
+                progress.append(progress_line)
+
+                if updated_show is None:
+                    errors.append(progress_line)
+                    continue
+
+                all_updates.extend(updates)
+
+                if updated_show is not show:
+                    store.put(updated_show)
+
+            # Emit per-show results in one write rather than a print per show
+            sys.stdout.write("\n".join(progress) + "\n")
+            sys.stdout.flush()
 
         # Save notifications
         if all_updates:
@@ -261,7 +367,7 @@ def check_updates(paths: dict[str, Path], cfg: config.Config, no_open: bool = Fa
         print(f"\nStorage error: {e}")
 
 
-def list_shows(paths: dict[str, Path]) -> None:
+def list_shows(paths: Mapping[str, Path]) -> None:
     """List all tracked shows.
 
     Args:
@@ -276,15 +382,17 @@ def list_shows(paths: dict[str, Path]) -> None:
 
         print(f"\nTracked Shows ({len(shows)}):\n")
 
-        for show in shows:
-            print(notifications.format_show_list_entry(show))
-            print()
+        # One write for the whole list rather than two prints per show
+        sys.stdout.write("".join(
+            notifications.format_show_list_entry(show) + "\n\n" for show in shows
+        ))
+        sys.stdout.flush()
 
     except storage.StorageError as e:
         print(f"\nStorage error: {e}")
 
 
-def view_timeline(paths: dict[str, Path], limit: int = 20, show_all: bool = False) -> None:
+def view_timeline(paths: Mapping[str, Path], limit: int = 20, show_all: bool = False) -> None:
     """View recent notifications from timeline.
 
     Args:
@@ -320,7 +428,7 @@ def view_timeline(paths: dict[str, Path], limit: int = 20, show_all: bool = Fals
         print(f"\nStorage error: {e}")
 
 
-def mark_watched_interactive(paths: dict[str, Path]) -> None:
+def mark_watched_interactive(paths: Mapping[str, Path]) -> None:
     """Interactive interface to mark notifications as watched.
 
     Args:
@@ -387,7 +495,7 @@ def mark_watched_interactive(paths: dict[str, Path]) -> None:
         print(f"\nStorage error: {e}")
 
 
-def interactive_menu(paths: dict[str, Path], cfg: config.Config) -> None:
+def interactive_menu(paths: Mapping[str, Path], cfg: config.Config) -> None:
     """Run the interactive menu.
 
     Args:
@@ -395,15 +503,8 @@ def interactive_menu(paths: dict[str, Path], cfg: config.Config) -> None:
         cfg: Configuration object
     """
     while True:
-        print_header()
-        print("1. Add show")
-        print("2. Remove show")
-        print("3. Check for updates")
-        print("4. List tracked shows")
-        print("5. View timeline")
-        print("6. Mark as watched")
-        print("7. Exit")
-        print()
+        sys.stdout.write(_MENU)
+        sys.stdout.flush()
 
         choice = input("Choose an option (1-7): ").strip()
 
@@ -428,56 +529,122 @@ def interactive_menu(paths: dict[str, Path], cfg: config.Config) -> None:
         input("\nPress Enter to continue...")
 
 
+# Subcommands that make API requests (None is the interactive menu)
+_API_COMMANDS = {None, "add", "check"}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser.
+
+    Returns:
+        Parser with one subcommand per CLI action
+    """
+    parser = argparse.ArgumentParser(
+        prog="episode-owl",
+        description="Track TV shows and anime for new episodes."
+    )
+    sub = parser.add_subparsers(dest="command", metavar="command")
+
+    add_parser = sub.add_parser("add", help="Search for a show and start tracking it")
+    add_parser.add_argument("query", nargs="*", help=argparse.SUPPRESS)
+
+    sub.add_parser("remove", help="Stop tracking a show")
+
+    check_parser = sub.add_parser("check", help="Check tracked shows for new episodes")
+    check_parser.add_argument(
+        "--no-open",
+        action="store_true",
+        help="Don't auto-open the timeline file"
+    )
+    check_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Check every show, even if its next episode hasn't aired yet"
+    )
+
+    sub.add_parser("list", help="List tracked shows")
+
+    timeline_parser = sub.add_parser("timeline", help="View recent notifications")
+    timeline_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Include watched episodes"
+    )
+    timeline_parser.add_argument(
+        "limit",
+        nargs="?",
+        type=int,
+        default=20,
+        help="Maximum number of entries to show (default: 20)"
+    )
+
+    sub.add_parser("mark", help="Mark episodes as watched")
+
+    return parser
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """Parse command-line arguments, accepting commands in any case.
+
+    Args:
+        argv: Arguments after the program name
+
+    Returns:
+        Parsed arguments
+    """
+    argv = list(argv)
+
+    # Commands have always been case-insensitive ("episode-owl Check")
+    if argv and not argv[0].startswith("-"):
+        argv[0] = argv[0].lower()
+
+    return build_parser().parse_args(argv)
+
+
 def main():
     """Main entry point for the CLI."""
+    args = parse_args(sys.argv[1:])
+
     # Get paths and config
     paths = config.get_default_paths()
     cfg = config.load_config(paths["config"])
 
-    # If command-line arguments provided, use them
-    if len(sys.argv) > 1:
-        command = sys.argv[1].lower()
+    # Commands that never talk to TVMaze skip loading the API client
+    api = None
+    if args.command in _API_COMMANDS:
+        from . import api
+        api.enable_cache(paths["cache"])
 
-        if command == "add":
-            if len(sys.argv) > 2:
+    try:
+        if args.command == "add":
+            if args.query:
                 # Non-interactive mode not implemented yet
                 print("Use interactive mode for now")
             else:
                 add_show_interactive(paths, cfg)
 
-        elif command == "remove":
+        elif args.command == "remove":
             remove_show_interactive(paths)
 
-        elif command == "check":
-            # Check for --no-open flag
-            no_open = "--no-open" in sys.argv
-            check_updates(paths, cfg, no_open=no_open)
+        elif args.command == "check":
+            check_updates(paths, cfg, no_open=args.no_open, force=args.force)
 
-        elif command == "list":
+        elif args.command == "list":
             list_shows(paths)
 
-        elif command == "timeline":
-            # Parse flags and arguments
-            show_all = "--all" in sys.argv
-            # Get limit (number) if provided
-            limit = 20
-            for arg in sys.argv[2:]:
-                if arg.isdigit():
-                    limit = int(arg)
-                    break
-
-            view_timeline(paths, limit, show_all=show_all)
+        elif args.command == "timeline":
+            view_timeline(paths, args.limit, show_all=args.all)
 
-        elif command == "mark":
+        elif args.command == "mark":
             mark_watched_interactive(paths)
 
         else:
-            print(f"Unknown command: {command}")
-            print("Available commands: add, remove, check [--no-open], list, timeline [--all], mark")
-            sys.exit(1)
-    else:
-        # Run interactive menu
-        interactive_menu(paths, cfg)
+            # Run interactive menu
+            interactive_menu(paths, cfg)
+    finally:
+        # Release pooled connections and the response cache
+        if api is not None:
+            api.close()
 
 
 if __name__ == "__main__":
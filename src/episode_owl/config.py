@@ -1,9 +1,17 @@
 """Configuration management for Episode Owl."""
 
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from . import jsonio
+
+
+# Application data directory (repository root / data)
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
 
 
 @dataclass
@@ -21,6 +29,10 @@ class Config:
         notification_sound: Play sound with desktop notifications
         archive_watched_after_days: Days before archiving watched notifications
         include_specials: Track special episodes (movies, OVAs) - "smart", "all", or "none"
+        api_concurrency: Maximum number of shows fetched in parallel during check
+        search_result_limit: Maximum number of API search results to rank
+        ended_show_ttl_days: Days an ended show's cached episode list is reused without a request
+        ended_recheck_days: Days an ended show with no new episodes is skipped during check
     """
     output_path: str = "data/notifications.txt"
     date_format: str = "%Y-%m-%d"
@@ -32,6 +44,43 @@ class Config:
     notification_sound: bool = False
     archive_watched_after_days: int = 30
     include_specials: str = "smart"
+    api_concurrency: int = 4
+    search_result_limit: int = 15
+    ended_show_ttl_days: int = 7
+    ended_recheck_days: int = 30
+
+
+# Expected type of each Config field, built once rather than on every load
+_FIELD_TYPES: Mapping[str, type] = MappingProxyType({f.name: f.type for f in fields(Config)})
+
+
+def _validate_config_data(data: object) -> dict:
+    """Check decoded config data against the Config field types.
+
+    Args:
+        data: Decoded config.json contents
+
+    Returns:
+        The known Config fields from data
+
+    Raises:
+        TypeError: If data is not an object or a known field has the wrong type
+    """
+    if not isinstance(data, dict):
+        raise TypeError(f"expected a JSON object, got {type(data).__name__}")
+
+    # Unknown keys are ignored for backward compatibility
+    known = {k: v for k, v in data.items() if k in _FIELD_TYPES}
+
+    for name, value in known.items():
+        expected = _FIELD_TYPES[name]
+        # bool is a subclass of int, but true/false is not a valid number here
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise TypeError(
+                f"{name} must be {expected.__name__}, got {type(value).__name__}"
+            )
+
+    return known
 
 
 def load_config(config_path: Path) -> Config:
@@ -41,20 +90,16 @@ def load_config(config_path: Path) -> Config:
         config_path: Path to config.json file
 
     Returns:
-        Config object with loaded or default values
+        Config object with loaded values, or defaults if the file is
+        malformed or any known setting has the wrong type
     """
     if not config_path.exists():
         return Config()
 
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = jsonio.loads(config_path.read_bytes())
 
-        # Filter to only known Config fields for backward compatibility
-        config_fields = {f.name for f in Config.__dataclass_fields__.values()}
-        filtered_data = {k: v for k, v in data.items() if k in config_fields}
-
-        return Config(**filtered_data)
+        return Config(**_validate_config_data(data))
     except (json.JSONDecodeError, TypeError) as e:
         # If config is malformed, return defaults
         print(f"Warning: Could not parse config file: {e}")
@@ -70,21 +115,22 @@ def save_config(config: Config, config_path: Path) -> None:
     """
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(asdict(config), f, indent=2)
+    config_path.write_bytes(jsonio.dumps(asdict(config), indent=True))
 
 
-def get_default_paths() -> dict[str, Path]:
+@lru_cache(maxsize=1)
+def get_default_paths() -> Mapping[str, Path]:
     """Get default paths for application data.
 
+    The mapping is built once and shared, so it is read-only.
+
     Returns:
-        Dictionary with paths for shows, notifications, watched, and config files
+        Mapping with paths for shows, notifications, watched, config, and cache files
     """
-    base_dir = Path(__file__).parent.parent.parent / "data"
-
-    return {
-        "shows": base_dir / "shows.json",
-        "notifications": base_dir / "notifications.txt",
-        "watched": base_dir / "watched.json",
-        "config": base_dir / "config.json",
-    }
+    return MappingProxyType({
+        "shows": DATA_DIR / "shows.json",
+        "notifications": DATA_DIR / "notifications.txt",
+        "watched": DATA_DIR / "watched.json",
+        "config": DATA_DIR / "config.json",
+        "cache": DATA_DIR / "cache.sqlite3",
+    })
@@ -0,0 +1,59 @@
+"""JSON encoding and decoding, using orjson when it is installed."""
+
+import json
+from typing import Any
+
+# orjson parses and serializes several times faster than the stdlib and
+# works on bytes directly; it's optional, so fall back to json without it
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode a JSON document.
+
+    Args:
+        data: JSON text as bytes or str
+
+    Returns:
+        Decoded value
+
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, newline: bool = False) -> bytes:
+    """Encode a value as UTF-8 JSON.
+
+    Args:
+        obj: Value to encode
+        indent: If True, pretty-print with two-space indentation
+        newline: If True, end the output with a newline
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    if newline:
+        text += "\n"
+
+    return text.encode("utf-8")
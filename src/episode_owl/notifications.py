@@ -1,11 +1,20 @@
 """Notification formatting for episode updates."""
 
+import re
 from datetime import datetime
+from functools import lru_cache
 from typing import NamedTuple
 
 from .tracker import Episode, ShowUpdate
 
 
+# "date | show | code | title": exactly four fields, each stripped
+_LINE_RE = re.compile(
+    r"\s*(?P<date>[^|]*?)\s*\|\s*(?P<show_name>[^|]*?)\s*"
+    r"\|\s*(?P<episode_code>[^|]*?)\s*\|\s*(?P<title>[^|]*?)\s*"
+)
+
+
 def format_episode_code(episode: Episode) -> str:
     """Format episode as SxxExx or Exx for absolute numbering.
 
@@ -15,11 +24,25 @@ def format_episode_code(episode: Episode) -> str:
     Returns:
         Formatted episode code
     """
-    if episode.season is not None:
-        return f"S{episode.season:02d}E{episode.number:02d}"
+    return _episode_code(episode.season, episode.number)
+
+
+@lru_cache(maxsize=4096)
+def _episode_code(season: int | None, number: int) -> str:
+    """Format an episode code, cached since the same few codes recur.
+
+    Args:
+        season: Season number, or None for absolute numbering
+        number: Episode number
+
+    Returns:
+        Formatted episode code
+    """
+    if season is not None:
+        return f"S{season:02d}E{number:02d}"
     else:
         # Use absolute numbering for shows without seasons
-        return f"E{episode.number:03d}"
+        return f"E{number:03d}"
 
 
 def format_notification(
@@ -37,7 +60,20 @@ def format_notification(
     Returns:
         Formatted notification line
     """
-    date_str = datetime.now().strftime(date_format)
+    return _format_with_date(show_name, episode, datetime.now().strftime(date_format))
+
+
+def _format_with_date(show_name: str, episode: Episode, date_str: str) -> str:
+    """Format a notification line using an already formatted date.
+
+    Args:
+        show_name: Name of the show
+        episode: Episode information
+        date_str: Formatted date for the line
+
+    Returns:
+        Formatted notification line
+    """
     episode_code = format_episode_code(episode)
     title = episode.title
 
@@ -70,7 +106,13 @@ def format_multiple_notifications(
     Returns:
         List of formatted notification lines
     """
-    return [format_show_update(update, date_format) for update in updates]
+    # Every line in a batch carries the same date, so format it once
+    date_str = datetime.now().strftime(date_format)
+
+    return [
+        _format_with_date(update.show_name, update.episode, date_str)
+        for update in updates
+    ]
 
 
 def parse_notification_line(line: str) -> dict | None:
@@ -83,17 +125,12 @@ def parse_notification_line(line: str) -> dict | None:
         Dictionary with date, show_name, episode_code, and title
         or None if line cannot be parsed
     """
-    parts = [p.strip() for p in line.split('|')]
+    match = _LINE_RE.fullmatch(line)
 
-    if len(parts) != 4:
+    if not match:
         return None
 
-    return {
-        "date": parts[0],
-        "show_name": parts[1],
-        "episode_code": parts[2],
-        "title": parts[3]
-    }
+    return match.groupdict()
 
 
 def format_show_list_entry(show: dict) -> str:
@@ -137,6 +174,12 @@ def format_timeline_entry(line: str) -> str:
     Returns:
         Formatted string for display
     """
+    # A valid line has exactly three separators; counting them is a cheap
+    # C-level scan that rejects most garbage before the regex runs. (The
+    # date follows date_format, so its shape can't be checked here.)
+    if line.count('|') != 3:
+        return line
+
     parsed = parse_notification_line(line)
 
     if not parsed:
@@ -2,6 +2,7 @@
 
 import sys
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
@@ -172,9 +173,14 @@ def _send_plyer_notification(title: str, message: str, duration: int) -> None:
     )
 
 
+@lru_cache(maxsize=1)
 def is_notification_supported() -> bool:
     """Check if desktop notifications are supported on this system.
 
+    The result is cached for the process; call
+    is_notification_supported.cache_clear() to probe again, e.g. after
+    installing a backend.
+
     Returns:
         True if notifications can be sent, False otherwise
     """
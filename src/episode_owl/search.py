@@ -1,7 +1,7 @@
 """Fuzzy search and matching logic for show names."""
 
+import heapq
 from typing import NamedTuple
-from rapidfuzz import fuzz, process
 
 
 class SearchResult(NamedTuple):
@@ -50,31 +50,49 @@ def rank_search_results(query: str, api_results: list[dict], limit: int = 5) ->
     if not api_results:
         return []
 
-    results = []
-    for api_result in api_results:
-        show = api_result.get("show", {})
+    # Imported here so commands that never search skip loading rapidfuzz
+    from rapidfuzz import fuzz, process
+
+    shows = [api_result.get("show", {}) for api_result in api_results]
+    names = [show.get("name", "Unknown") for show in shows]
+
+    # Casefold once up front (handles e.g. "ß" vs "SS", unlike lower())
+    query_key = query.casefold()
+    name_keys = [name.casefold() for name in names]
+
+    # Score every name in one rapidfuzz call rather than one call per result
+    scores = [0.0] * len(names)
+    for _, score, index in process.extract(
+        query_key,
+        name_keys,
+        scorer=fuzz.ratio,
+        limit=None
+    ):
+        scores[index] = score
+
+    # Top results by score descending, then by name, without sorting them
+    # all; only the winners are turned into SearchResult objects
+    top = heapq.nsmallest(
+        limit,
+        range(len(names)),
+        key=lambda i: (-scores[i], names[i])
+    )
 
-        show_id = show.get("id", 0)
-        name = show.get("name", "Unknown")
+    results = []
+    for index in top:
+        show = shows[index]
         premiered = show.get("premiered", "")
         year = int(premiered[:4]) if premiered and len(premiered) >= 4 else None
-        status = show.get("status", "Unknown")
-
-        # Calculate fuzzy match score
-        score = fuzz.ratio(query.lower(), name.lower())
 
         results.append(SearchResult(
-            show_id=show_id,
-            name=name,
+            show_id=show.get("id", 0),
+            name=names[index],
             year=year,
-            status=status,
-            score=score
+            status=show.get("status", "Unknown"),
+            score=scores[index]
         ))
 
-    # Sort by score descending, then by name
-    results.sort(key=lambda r: (-r.score, r.name))
-
-    return results[:limit]
+    return results
 
 
 def find_show_by_name(query: str, shows: list[dict], threshold: float = 60.0) -> int | None:
@@ -91,25 +109,19 @@ def find_show_by_name(query: str, shows: list[dict], threshold: float = 60.0) ->
     if not shows:
         return None
 
-    # Build list of (name, show_id) tuples
-    choices = [(show["name"], show["id"]) for show in shows]
+    from rapidfuzz import fuzz, process
 
-    # Use process.extractOne to find best match
+    # Match against {show_id: casefolded name} so the best match carries its
+    # ID; the cutoff lets rapidfuzz skip candidates that can't reach it.
     # Use token_set_ratio for better partial matching
     result = process.extractOne(
-        query,
-        [choice[0] for choice in choices],
-        scorer=fuzz.token_set_ratio
+        query.casefold(),
+        {show["id"]: show["name"].casefold() for show in shows},
+        scorer=fuzz.token_set_ratio,
+        score_cutoff=threshold
     )
 
-    if result and result[1] >= threshold:
-        # Find the show_id for the matched name
-        matched_name = result[0]
-        for name, show_id in choices:
-            if name == matched_name:
-                return show_id
-
-    return None
+    return result[2] if result else None
 
 
 def format_search_result(result: SearchResult, index: int) -> str:
@@ -122,7 +134,6 @@ def format_search_result(result: SearchResult, index: int) -> str:
     Returns:
         Formatted string for display
     """
-    year_str = f"({result.year})" if result.year else ""
-    status_str = f"[{result.status}]"
+    year_str = f" ({result.year})" if result.year else ""
 
-    return f"{index}. {result.name} {year_str} {status_str} (Match: {result.score:.0f}%)"
+    return f"{index}. {result.name}{year_str} [{result.status}] (Match: {result.score:.0f}%)"
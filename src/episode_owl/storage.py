@@ -1,10 +1,25 @@
 """File I/O operations for persisting show and notification data."""
 
 import json
-import shutil
+import mmap
+import os
+from collections import deque
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from . import jsonio
+
+
+# First line of notification files in the append-only (newest last) order;
+# files without it were written newest first and are converted on append
+_TIMELINE_HEADER = "# Episode Owl timeline (newest at the bottom)"
+_TIMELINE_HEADER_LINE = (_TIMELINE_HEADER + "\n").encode('utf-8')
+
+# Full notification loads by path, as (mtime_ns, size, lines newest first);
+# an entry is only used while the file's mtime and size still match
+_NOTIF_CACHE: dict[Path, tuple[int, int, list[str]]] = {}
 
 
 class StorageError(Exception):
@@ -28,8 +43,7 @@ def load_shows(file_path: Path) -> list[dict]:
         return []
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = jsonio.loads(file_path.read_bytes())
         return data.get("shows", [])
     except json.JSONDecodeError as e:
         raise StorageError(f"Invalid JSON in {file_path}: {e}")
@@ -38,7 +52,11 @@ def load_shows(file_path: Path) -> list[dict]:
 
 
 def save_shows(shows: list[dict], file_path: Path) -> None:
-    """Save tracked shows to JSON file with backup.
+    """Save tracked shows to JSON file durably.
+
+    The file is replaced via write_atomic, so after a crash it holds either
+    the old or the new list, never a partial write. If the file already
+    holds exactly this data, nothing is written.
 
     Args:
         shows: List of show dictionaries
@@ -47,28 +65,203 @@ def save_shows(shows: list[dict], file_path: Path) -> None:
     Raises:
         StorageError: If file cannot be written
     """
-    # Create backup if file exists
-    if file_path.exists():
-        backup_path = file_path.with_suffix('.json.bak')
-        try:
-            shutil.copy2(file_path, backup_path)
-        except IOError:
-            pass  # Backup is optional
+    new_bytes = jsonio.dumps({"shows": shows}, indent=True, newline=True)
+
+    # Skip the write (and its fsyncs) when the content is unchanged
+    try:
+        if file_path.read_bytes() == new_bytes:
+            return
+    except OSError:
+        pass  # Missing or unreadable; fall through to a full write
+
+    try:
+        write_atomic(file_path, new_bytes)
+    except IOError as e:
+        raise StorageError(f"Cannot write to file {file_path}: {e}")
+
+
+def write_atomic(file_path: Path, data: bytes) -> None:
+    """Replace a file's contents atomically and durably.
+
+    The data is written to a sibling temporary file, flushed to disk, and
+    renamed over the target, so readers and crashes only ever see the old
+    or the new contents.
+
+    Args:
+        file_path: File to write
+        data: New file contents
 
+    Raises:
+        OSError: If the file cannot be written
+    """
     # Ensure directory exists
     file_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Write to temporary file first and make sure it reaches the disk
+    temp_path = file_path.with_name(file_path.name + '.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # Move temporary file to actual location, then persist the rename
+    os.replace(temp_path, file_path)
+    _fsync_dir(file_path.parent)
+
+
+def _fsync_dir(dir_path: Path) -> None:
+    """Flush a directory entry so a rename inside it survives a crash.
+
+    Skipped on Windows, where directories can't be opened this way.
+
+    Args:
+        dir_path: Directory to flush
+    """
+    if os.name == 'nt':
+        return
+
     try:
-        # Write to temporary file first
-        temp_path = file_path.with_suffix('.json.tmp')
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            json.dump({"shows": shows}, f, indent=2)
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
 
-        # Move temporary file to actual location
-        temp_path.replace(file_path)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # Some filesystems don't support syncing directories
+    finally:
+        os.close(fd)
 
-    except IOError as e:
-        raise StorageError(f"Cannot write to file {file_path}: {e}")
+
+def _load_shows_index(file_path: Path) -> dict[int, dict]:
+    """Load tracked shows keyed by show ID, in file order.
+
+    Args:
+        file_path: Path to shows.json file
+
+    Returns:
+        Dictionary mapping show ID to show dictionary
+
+    Raises:
+        StorageError: If file cannot be read or parsed
+    """
+    return {show["id"]: show for show in load_shows(file_path)}
+
+
+class ShowStore:
+    """Batch changes to tracked shows: load once, write once.
+
+    Use as a context manager. Shows are loaded on entry, changed in memory,
+    and saved in a single write on exit if anything changed. Nothing is
+    written if the block raises.
+
+    Attributes:
+        file_path: Path to shows.json file
+        dirty: True if shows have changed since loading
+    """
+
+    def __init__(self, file_path: Path):
+        """Initialize the store.
+
+        Args:
+            file_path: Path to shows.json file
+        """
+        self.file_path = file_path
+        self.dirty = False
+        self._index: dict[int, dict] = {}
+
+    def __enter__(self) -> "ShowStore":
+        """Load shows from disk.
+
+        Raises:
+            StorageError: If file cannot be read or parsed
+        """
+        self._index = _load_shows_index(self.file_path)
+        self.dirty = False
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Save shows if they changed and the block completed.
+
+        Raises:
+            StorageError: If file cannot be written
+        """
+        if self.dirty and exc_type is None:
+            save_shows(self.shows, self.file_path)
+            self.dirty = False
+
+    @property
+    def shows(self) -> list[dict]:
+        """List of tracked shows in file order."""
+        return list(self._index.values())
+
+    def get(self, show_id: int) -> dict | None:
+        """Get a show by ID.
+
+        Args:
+            show_id: TVMaze show ID
+
+        Returns:
+            Show dictionary or None if not tracked
+        """
+        return self._index.get(show_id)
+
+    def add(self, show: dict) -> None:
+        """Start tracking a show.
+
+        Args:
+            show: Show dictionary with id, name, etc.
+
+        Raises:
+            StorageError: If the show is already tracked
+        """
+        if show["id"] in self._index:
+            raise StorageError(f"Show '{show['name']}' is already being tracked")
+
+        self._index[show["id"]] = show
+        self.dirty = True
+
+    def put(self, show: dict) -> None:
+        """Add a show or replace the stored show with the same ID.
+
+        Args:
+            show: Show dictionary with id, name, etc.
+        """
+        self._index[show["id"]] = show
+        self.dirty = True
+
+    def remove(self, show_id: int) -> bool:
+        """Stop tracking a show.
+
+        Args:
+            show_id: TVMaze show ID
+
+        Returns:
+            True if show was removed, False if not found
+        """
+        if self._index.pop(show_id, None) is None:
+            return False
+
+        self.dirty = True
+        return True
+
+    def update(self, show_id: int, updates: dict) -> bool:
+        """Update fields of a tracked show.
+
+        Args:
+            show_id: TVMaze show ID
+            updates: Dictionary of fields to update
+
+        Returns:
+            True if show was updated, False if not found
+        """
+        show = self._index.get(show_id)
+        if show is None:
+            return False
+
+        show.update(updates)
+        self.dirty = True
+        return True
 
 
 def add_show(show: dict, file_path: Path) -> None:
@@ -81,14 +274,8 @@ def add_show(show: dict, file_path: Path) -> None:
     Raises:
         StorageError: If file operations fail
     """
-    shows = load_shows(file_path)
-
-    # Check if show already exists
-    if any(s["id"] == show["id"] for s in shows):
-        raise StorageError(f"Show '{show['name']}' is already being tracked")
-
-    shows.append(show)
-    save_shows(shows, file_path)
+    with ShowStore(file_path) as store:
+        store.add(show)
 
 
 def remove_show(show_id: int, file_path: Path) -> bool:
@@ -104,16 +291,8 @@ def remove_show(show_id: int, file_path: Path) -> bool:
     Raises:
         StorageError: If file operations fail
     """
-    shows = load_shows(file_path)
-    original_count = len(shows)
-
-    shows = [s for s in shows if s["id"] != show_id]
-
-    if len(shows) < original_count:
-        save_shows(shows, file_path)
-        return True
-
-    return False
+    with ShowStore(file_path) as store:
+        return store.remove(show_id)
 
 
 def update_show(show_id: int, updates: dict, file_path: Path) -> bool:
@@ -130,49 +309,168 @@ def update_show(show_id: int, updates: dict, file_path: Path) -> bool:
     Raises:
         StorageError: If file operations fail
     """
-    shows = load_shows(file_path)
+    with ShowStore(file_path) as store:
+        return store.update(show_id, updates)
+
+
+def _read_lines(file_path: Path) -> list[str]:
+    """Read the non-empty, stripped lines of a file in file order.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        List of lines
+    """
+    # Decode and split in one go rather than iterating line by line
+    text = file_path.read_bytes().decode('utf-8')
+    return [line for line in (raw.strip() for raw in text.split('\n')) if line]
+
+
+def _first_line(file_path: Path) -> str:
+    """Read the first non-empty line of a file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Stripped line, or "" if the file has no content
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for raw in f:
+            line = raw.strip()
+            if line:
+                return line
 
-    updated = False
-    for show in shows:
-        if show["id"] == show_id:
-            show.update(updates)
-            updated = True
-            break
+    return ""
+
+
+def _iter_line_spans_reversed(mm: mmap.mmap) -> Iterator[tuple[int, int]]:
+    """Yield the byte spans of non-blank lines from the end of a mapped file.
+
+    Args:
+        mm: Memory-mapped file contents
+
+    Yields:
+        (start, end) offsets of each non-blank line, last line first
+    """
+    end = len(mm)
+
+    while end > 0:
+        start = mm.rfind(b"\n", 0, end) + 1
+        if mm[start:end].strip():
+            yield start, end
+        end = start - 1
+
+
+def _tail_lines(file_path: Path, limit: int) -> list[str]:
+    """Read the last non-empty lines of a file by scanning back from the end.
+
+    The file is memory-mapped and only the bytes of the returned lines are
+    copied and decoded, however large the file.
+
+    Args:
+        file_path: Path to the file
+        limit: Maximum number of lines to return
+
+    Returns:
+        Stripped lines, last line of the file first
+    """
+    with open(file_path, 'rb') as f:
+        # mmap can't map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
 
-    if updated:
-        save_shows(shows, file_path)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [
+                mm[start:end].decode('utf-8').strip()
+                for start, end in islice(_iter_line_spans_reversed(mm), limit)
+            ]
 
-    return updated
+
+def _timeline_bytes(lines: Iterable[str]) -> bytes:
+    """Encode a notifications file in the append-only order.
+
+    Args:
+        lines: Lines to write, oldest first, without newlines
+
+    Returns:
+        File contents, starting with the timeline header
+    """
+    return _TIMELINE_HEADER_LINE + "".join(line + '\n' for line in lines).encode('utf-8')
+
+
+def _is_old_order(file_path: Path) -> bool:
+    """Check whether a notifications file predates the append-only order.
+
+    Files written by append_notifications start with the timeline header;
+    anything else was written newest entry first.
+
+    Args:
+        file_path: Path to an existing notifications file
+
+    Returns:
+        True if the file is in the old newest-first order
+    """
+    return _first_line(file_path) != _TIMELINE_HEADER
 
 
 def load_notifications(file_path: Path, limit: Optional[int] = None) -> list[str]:
-    """Load notifications from text file.
+    """Load notifications from text file, newest first.
+
+    The file itself is append-only (newest entry last), so a limited load
+    only reads the end of the file. Full loads are cached in memory until
+    the file changes, so back-to-back loads don't re-read it.
 
     Args:
         file_path: Path to notifications.txt file
-        limit: Maximum number of notifications to load (from top)
+        limit: Maximum number of notifications to load (newest first)
 
     Returns:
-        List of notification lines
+        List of notification lines, newest first
     """
-    if not file_path.exists():
-        return []
-
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f if line.strip()]
+        stat = file_path.stat()
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        raise StorageError(f"Cannot read file {file_path}: {e}")
 
-        if limit is not None:
-            return lines[:limit]
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _NOTIF_CACHE.get(file_path)
+    if cached is not None and cached[:2] == key:
+        # Copies, so callers can't modify the cached list
+        return cached[2][:limit]
 
-        return lines
+    try:
+        if limit is not None and not _is_old_order(file_path):
+            lines = _tail_lines(file_path, limit)
+            # The header is only reached when there are fewer than limit entries
+            if lines and lines[-1] == _TIMELINE_HEADER:
+                lines.pop()
+            return lines
+
+        lines = _read_lines(file_path)
+        if lines and lines[0] == _TIMELINE_HEADER:
+            del lines[0]
+            lines.reverse()
+        # Otherwise the file is in the old order, which is already newest first
+
+        _NOTIF_CACHE[file_path] = (*key, lines)
+        return lines[:limit]
 
     except IOError as e:
         raise StorageError(f"Cannot read file {file_path}: {e}")
 
 
 def append_notifications(notifications: list[str], file_path: Path) -> None:
-    """Append new notifications to the top of the file.
+    """Add new notifications to the timeline.
+
+    New lines are appended to the end of the file, so existing entries are
+    never rewritten. Each batch is written in reverse, which keeps
+    load_notifications returning it in its original order above older
+    entries. A file in the old newest-first order is converted once,
+    atomically, before the first append.
 
     Args:
         notifications: List of notification lines to add
@@ -184,19 +482,26 @@ def append_notifications(notifications: list[str], file_path: Path) -> None:
     if not notifications:
         return
 
+    _NOTIF_CACHE.pop(file_path, None)
+
     # Ensure directory exists
     file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Load existing notifications
-    existing = load_notifications(file_path)
+    try:
+        if file_path.exists() and _is_old_order(file_path):
+            write_atomic(file_path, _timeline_bytes(reversed(_read_lines(file_path))))
 
-    # Combine new (at top) + existing
-    all_notifications = notifications + existing
+        with open(file_path, 'ab+') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                # New file: mark it as being in the append-only order
+                prefix = _TIMELINE_HEADER_LINE
+            else:
+                # Don't glue the first new line onto an unterminated last line
+                f.seek(-1, os.SEEK_END)
+                prefix = b"" if f.read(1) == b"\n" else b"\n"
 
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for notification in all_notifications:
-                f.write(notification + '\n')
+            text = "".join(line + '\n' for line in reversed(notifications))
+            f.write(prefix + text.encode('utf-8'))
 
     except IOError as e:
         raise StorageError(f"Cannot write to file {file_path}: {e}")
@@ -205,6 +510,11 @@ def append_notifications(notifications: list[str], file_path: Path) -> None:
 def prune_notifications(file_path: Path, keep: int) -> int:
     """Keep only the N most recent notifications.
 
+    The newest entries sit at the end of the file, so pruning drops a
+    prefix. The file is streamed once, holding only the last `keep` lines
+    in memory, and those lines are written back as-is, without decoding
+    or re-encoding. Either way the file is replaced atomically.
+
     Args:
         file_path: Path to notifications.txt file
         keep: Number of notifications to keep
@@ -215,21 +525,35 @@ def prune_notifications(file_path: Path, keep: int) -> int:
     Raises:
         StorageError: If file operations fail
     """
-    notifications = load_notifications(file_path)
-    original_count = len(notifications)
-
-    if original_count <= keep:
+    if not file_path.exists():
         return 0
 
-    # Keep only the first N lines (newest)
-    notifications = notifications[:keep]
+    _NOTIF_CACHE.pop(file_path, None)
 
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for notification in notifications:
-                f.write(notification + '\n')
-
-        return original_count - keep
+        # Files in the old newest-first order are rewritten in the new order
+        if _is_old_order(file_path):
+            notifications = _read_lines(file_path)
+            kept_lines = notifications[:max(keep, 0)]
+            write_atomic(file_path, _timeline_bytes(reversed(kept_lines)))
+            return len(notifications) - len(kept_lines)
+
+        header = _TIMELINE_HEADER.encode('utf-8')
+        kept: deque[bytes] = deque(maxlen=max(keep, 0))
+        total = 0
+
+        with open(file_path, 'rb') as f:
+            for raw in f:
+                line = raw.strip()
+                if line and line != header:
+                    kept.append(raw)
+                    total += 1
+
+        removed = total - len(kept)
+        if removed:
+            write_atomic(file_path, _TIMELINE_HEADER_LINE + b"".join(kept))
+
+        return removed
 
     except IOError as e:
         raise StorageError(f"Cannot write to file {file_path}: {e}")
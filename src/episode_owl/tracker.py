@@ -1,7 +1,8 @@
 """Core tracking logic for comparing episodes and detecting updates."""
 
-from datetime import datetime
-from typing import NamedTuple, Optional
+from datetime import date, datetime, timedelta
+from itertools import takewhile
+from typing import Iterator, NamedTuple, Optional
 
 
 class Episode(NamedTuple):
@@ -45,20 +46,18 @@ def parse_episode_from_api(episode_data: dict) -> Episode:
     Returns:
         Episode object
     """
-    season = episode_data.get("season")
-    number = episode_data.get("number", 0)
-    title = episode_data.get("name", f"Episode {number}")
-    airdate = episode_data.get("airdate", "")
-    absolute_number = episode_data.get("number")  # Some shows use absolute numbering
-    episode_type = episode_data.get("type")  # Type: regular, significant_special, etc.
+    # Called for every episode of every show; bind the lookup once
+    get = episode_data.get
+    number = get("number", 0)
 
     return Episode(
-        season=season,
+        season=get("season"),
         number=number,
-        title=title,
-        airdate=airdate,
-        absolute_number=absolute_number,
-        episode_type=episode_type
+        # The placeholder title is only formatted when the name is missing
+        title=get("name") or f"Episode {number}",
+        airdate=get("airdate", ""),
+        absolute_number=get("number"),  # Some shows use absolute numbering
+        episode_type=get("type")  # Type: regular, significant_special, etc.
     )
 
 
@@ -102,13 +101,9 @@ def get_latest_episode(episodes: list[Episode]) -> Episode | None:
     if not episodes:
         return None
 
-    # Sort by season (or 0 if None), then by episode number
-    sorted_episodes = sorted(
-        episodes,
-        key=lambda e: ((e.season or 0), e.number)
-    )
-
-    return sorted_episodes[-1]
+    # Highest season (or 0 if None), then episode number; scanning in
+    # reverse keeps the last of any ties, as a stable sort would
+    return max(reversed(episodes), key=lambda e: ((e.season or 0), e.number))
 
 
 def find_new_episodes(
@@ -124,7 +119,24 @@ def find_new_episodes(
     Returns:
         List of new episodes, sorted chronologically
     """
-    new_episodes = [ep for ep in episodes if compare_episodes(last_seen, ep)]
+    last_season, last_episode = last_seen
+
+    # Same rules as compare_episodes, inlined to avoid a call per episode
+    if last_season is None:
+        new_episodes = [
+            ep for ep in episodes
+            if (ep.number if ep.absolute_number is None else ep.absolute_number) > last_episode
+        ]
+    else:
+        threshold = (last_season, last_episode)
+        new_episodes = [
+            ep for ep in episodes
+            if (
+                (ep.number if ep.absolute_number is None else ep.absolute_number) > last_episode
+                if ep.season is None
+                else (ep.season, ep.number) > threshold
+            )
+        ]
 
     # Sort by season and episode number
     new_episodes.sort(key=lambda e: ((e.season or 0), e.number))
@@ -132,27 +144,32 @@ def find_new_episodes(
     return new_episodes
 
 
-def should_include_episode(episode: Episode, include_specials: str = "smart") -> bool:
+def should_include_episode(
+    episode: Episode,
+    include_specials: str = "smart",
+    today: str | None = None
+) -> bool:
     """Determine if an episode should be included in tracking.
 
     Args:
         episode: Episode to check
         include_specials: How to handle specials - "smart" (movies only), "all", or "none"
+        today: Today's date as YYYY-MM-DD (defaults to the current date)
 
     Returns:
         True if episode should be tracked
     """
-    # Skip episodes without air dates (not yet released)
-    if not episode.airdate:
+    airdate = episode.airdate
+
+    # Skip episodes without air dates (not yet released) or with invalid ones
+    if not airdate or len(airdate) != 10 or airdate[4] != '-' or airdate[7] != '-':
         return False
 
-    # Check if episode has aired
-    try:
-        airdate = datetime.strptime(episode.airdate, "%Y-%m-%d")
-        if airdate > datetime.now():
-            return False
-    except ValueError:
-        # Invalid date format, skip
+    if today is None:
+        today = date.today().isoformat()
+
+    # Check if episode has aired (YYYY-MM-DD strings sort chronologically)
+    if airdate > today:
         return False
 
     # Handle special episodes (season 0) based on mode
@@ -174,23 +191,124 @@ def should_include_episode(episode: Episode, include_specials: str = "smart") ->
     return True
 
 
-def filter_aired_episodes(episodes: list[Episode], include_specials: str = "smart") -> list[Episode]:
+def filter_aired_episodes(
+    episodes: list[Episode],
+    include_specials: str = "smart",
+    today: str | None = None
+) -> list[Episode]:
     """Filter episodes to only include those that have aired.
 
     Args:
         episodes: List of all episodes
         include_specials: How to handle specials - "smart" (movies only), "all", or "none"
+        today: Today's date as YYYY-MM-DD (defaults to the current date)
 
     Returns:
         Filtered list of episodes
     """
-    return [ep for ep in episodes if should_include_episode(ep, include_specials)]
+    if today is None:
+        today = date.today().isoformat()
+
+    return [ep for ep in episodes if should_include_episode(ep, include_specials, today)]
+
+
+def _iter_newest_first(episodes_data: list[dict]) -> Iterator[Episode]:
+    """Lazily parse raw API episodes from newest to oldest.
+
+    Args:
+        episodes_data: Episode dictionaries from API
+
+    Returns:
+        Iterator of Episode objects ordered by season and number, descending
+    """
+    ordered = sorted(
+        episodes_data,
+        key=lambda ep: ((ep.get("season") or 0), (ep.get("number") or 0)),
+        reverse=True
+    )
+
+    return map(parse_episode_from_api, ordered)
+
+
+def iter_new_episodes(
+    episodes_data: list[dict],
+    last_seen: tuple[int | None, int],
+    include_specials: str = "smart",
+    today: str | None = None
+) -> Iterator[Episode]:
+    """Yield aired episodes newer than last_seen, newest first.
+
+    Scans the raw API episode list from the end and stops at the first
+    episode that is not newer than last_seen, so only the new tail of
+    the list is parsed and date-checked. This is equivalent to
+    parse_episode_from_api + filter_aired_episodes + find_new_episodes,
+    but an up-to-date show costs a single comparison.
+
+    The scan runs in (season, number) order, while episodes without a
+    season (or a last_seen without one) are compared by absolute number.
+    In that case the order says nothing about which episodes are new, so
+    the whole list is checked instead of stopping early.
+
+    Args:
+        episodes_data: Episode dictionaries from API
+        last_seen: Tuple of (last_season, last_episode)
+        include_specials: How to handle specials - "smart" (movies only), "all", or "none"
+        today: Today's date as YYYY-MM-DD (defaults to the current date)
+
+    Yields:
+        New Episode objects in reverse chronological order
+    """
+    if today is None:
+        today = date.today().isoformat()
+
+    def is_new(episode: Episode) -> bool:
+        return compare_episodes(last_seen, episode)
+
+    if last_seen[0] is None or any(ep.get("season") is None for ep in episodes_data):
+        newer = filter(is_new, _iter_newest_first(episodes_data))
+    else:
+        newer = takewhile(is_new, _iter_newest_first(episodes_data))
+
+    for episode in newer:
+        if should_include_episode(episode, include_specials, today):
+            yield episode
+
+
+def find_latest_aired_episode(
+    episodes_data: list[dict],
+    include_specials: str = "smart",
+    today: str | None = None
+) -> Episode | None:
+    """Find the most recent aired episode in a raw API episode list.
+
+    Equivalent to parse_episode_from_api + filter_aired_episodes +
+    get_latest_episode, but stops parsing at the first aired episode
+    found from the end of the list.
+
+    Args:
+        episodes_data: Episode dictionaries from API
+        include_specials: How to handle specials - "smart" (movies only), "all", or "none"
+        today: Today's date as YYYY-MM-DD (defaults to the current date)
+
+    Returns:
+        Latest aired Episode or None if nothing has aired
+    """
+    if today is None:
+        today = date.today().isoformat()
+
+    for episode in _iter_newest_first(episodes_data):
+        if should_include_episode(episode, include_specials, today):
+            return episode
+
+    return None
 
 
 def create_show_dict(
     show_id: int,
     name: str,
-    latest_episode: Episode | None = None
+    latest_episode: Episode | None = None,
+    status: str | None = None,
+    now: str | None = None
 ) -> dict:
     """Create a show dictionary for storage.
 
@@ -198,18 +316,19 @@ def create_show_dict(
         show_id: TVMaze show ID
         name: Show name
         latest_episode: Most recent episode (for initial state)
+        status: TVMaze show status (Running, Ended, etc.)
+        now: Current time as an ISO timestamp (defaults to the current time)
 
     Returns:
         Dictionary ready for storage
     """
-    now = datetime.now().isoformat()
-
     show_dict = {
         "id": show_id,
         "name": name,
-        "last_checked": now,
+        "last_checked": now or datetime.now().isoformat(),
         "last_seen_season": None,
-        "last_seen_episode": 0
+        "last_seen_episode": 0,
+        "status": status
     }
 
     if latest_episode:
@@ -219,19 +338,134 @@ def create_show_dict(
     return show_dict
 
 
-def update_show_state(show: dict, latest_episode: Episode) -> dict:
+def update_show_state(
+    show: dict,
+    latest_episode: Episode,
+    next_airdate: str | None = None,
+    now: str | None = None
+) -> dict:
     """Update show's last_seen state with new episode.
 
     Args:
         show: Show dictionary
         latest_episode: Latest episode detected
+        next_airdate: Airdate of the next unaired episode (None if unknown)
+        now: Current time as an ISO timestamp (defaults to the current time);
+            pass one value when updating many shows in a batch
 
     Returns:
         Updated show dictionary (new dict, not mutated)
     """
-    updated = show.copy()
-    updated["last_checked"] = datetime.now().isoformat()
+    updated = record_next_airdate(show, next_airdate)
+    updated["last_checked"] = now or datetime.now().isoformat()
     updated["last_seen_season"] = latest_episode.season
     updated["last_seen_episode"] = latest_episode.number
+    updated.pop("no_new_since", None)
+
+    return updated
+
+
+def record_next_airdate(show: dict, next_airdate: str | None) -> dict:
+    """Record the next expected airdate after a successful check.
+
+    Also clears any one-off force_check flag, since the show has now
+    been checked.
+
+    Args:
+        show: Show dictionary
+        next_airdate: Airdate of the next unaired episode (None if unknown)
+
+    Returns:
+        Updated show dictionary (new dict, not mutated)
+    """
+    updated = show.copy()
+    updated["next_airdate"] = next_airdate
+    updated.pop("force_check", None)
 
     return updated
+
+
+def mark_no_new_episodes(show: dict, today: str | None = None) -> dict:
+    """Record that a check found no new episodes.
+
+    Args:
+        show: Show dictionary
+        today: Today's date as YYYY-MM-DD (defaults to the current date)
+
+    Returns:
+        Updated show dictionary (new dict, not mutated)
+    """
+    updated = show.copy()
+    updated["no_new_since"] = today or date.today().isoformat()
+
+    return updated
+
+
+def find_next_airdate(episodes_data: list[dict], today: str | None = None) -> str | None:
+    """Find the airdate of the next episode that has not aired yet.
+
+    TVMaze lists episodes in airing order, so the scan walks back from the
+    end and stops at the first episode that has already aired.
+
+    Args:
+        episodes_data: Raw episode dictionaries from TVMaze API
+        today: Today's date as YYYY-MM-DD (defaults to the current date)
+
+    Returns:
+        Earliest future airdate as YYYY-MM-DD, or None if nothing is scheduled
+    """
+    if today is None:
+        today = date.today().isoformat()
+
+    next_airdate = None
+
+    for ep in reversed(episodes_data):
+        airdate = ep.get("airdate")
+        if not airdate:
+            # TBA episodes carry no schedule information
+            continue
+        if airdate <= today:
+            break
+        if next_airdate is None or airdate < next_airdate:
+            next_airdate = airdate
+
+    return next_airdate
+
+
+def should_skip_check(
+    show: dict,
+    today: str | None = None,
+    ended_recheck_days: int = 0
+) -> bool:
+    """Determine if a show can be skipped because nothing new can have aired.
+
+    Args:
+        show: Show dictionary
+        today: Today's date as YYYY-MM-DD (defaults to the current date)
+        ended_recheck_days: Days an ended show with no new episodes goes
+            unchecked (0 checks ended shows every time)
+
+    Returns:
+        True if no check has been forced and either the show's next episode
+        is scheduled after today, or the show has ended and was found to
+        have nothing new within the last ended_recheck_days
+    """
+    if show.get("force_check"):
+        return False
+
+    if today is None:
+        today = date.today().isoformat()
+
+    next_airdate = show.get("next_airdate")
+    if next_airdate and next_airdate > today:
+        return True
+
+    no_new_since = show.get("no_new_since")
+    if show.get("status") == "Ended" and no_new_since and ended_recheck_days > 0:
+        try:
+            recheck_on = date.fromisoformat(no_new_since) + timedelta(days=ended_recheck_days)
+        except ValueError:
+            return False
+        return today < recheck_on.isoformat()
+
+    return False
@@ -4,11 +4,24 @@ import os
 import sys
 import subprocess
 import logging
+from functools import lru_cache
 from pathlib import Path
 
 
 logger = logging.getLogger(__name__)
 
+# Common CI environment variables
+_CI_INDICATORS = frozenset([
+    "CI",
+    "CONTINUOUS_INTEGRATION",
+    "GITHUB_ACTIONS",
+    "GITLAB_CI",
+    "CIRCLECI",
+    "TRAVIS",
+    "JENKINS_HOME",
+    "BUILDKITE",
+])
+
 
 def open_timeline_file(file_path: Path) -> bool:
     """Open timeline file in system default editor.
@@ -68,25 +81,19 @@ def _open_file_windows(file_path: Path) -> None:
         subprocess.Popen(["notepad.exe", str(file_path)])
 
 
+@lru_cache(maxsize=1)
 def is_running_in_ci() -> bool:
     """Check if running in CI/automated environment.
 
+    The environment doesn't change during a run, so the result is cached.
+
     Returns:
         True if running in CI environment
     """
-    # Common CI environment variables
-    ci_indicators = [
-        "CI",
-        "CONTINUOUS_INTEGRATION",
-        "GITHUB_ACTIONS",
-        "GITLAB_CI",
-        "CIRCLECI",
-        "TRAVIS",
-        "JENKINS_HOME",
-        "BUILDKITE",
-    ]
-
-    return any(os.getenv(indicator) for indicator in ci_indicators)
+    # Only indicators that are actually set need their values checked
+    present = _CI_INDICATORS & os.environ.keys()
+
+    return any(os.environ[indicator] for indicator in present)
 
 
 def should_auto_open(config_enabled: bool, cli_override: bool = False) -> bool:
@@ -1,9 +1,12 @@
 """Watched status tracking for notifications."""
 
 import json
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Set, NamedTuple
+from typing import Dict, List, Set, NamedTuple
+
+from . import jsonio, storage
 
 
 class NotificationKey(NamedTuple):
@@ -39,7 +42,8 @@ class NotificationKey(NamedTuple):
         Raises:
             ValueError: If string format is invalid
         """
-        parts = key_str.split('|')
+        # Split at most once past the three fields so extra ones are still rejected
+        parts = key_str.split('|', 3)
         if len(parts) != 3:
             raise ValueError(f"Invalid notification key format: {key_str}")
 
@@ -58,11 +62,16 @@ class NotificationKey(NamedTuple):
         Raises:
             ValueError: If line format is invalid
         """
-        parts = [p.strip() for p in line.split('|')]
+        # Only the first three fields matter; leave the title unsplit
+        parts = line.split('|', 3)
         if len(parts) < 3:
             raise ValueError(f"Invalid notification line format: {line}")
 
-        return NotificationKey(date=parts[0], show_name=parts[1], episode_code=parts[2])
+        return NotificationKey(
+            date=parts[0].strip(),
+            show_name=parts[1].strip(),
+            episode_code=parts[2].strip()
+        )
 
 
 class WatchedState:
@@ -81,29 +90,38 @@ class WatchedState:
         """
         self.file_path = file_path
         self.watched_keys: Set[str] = set()
+        # The same keys bucketed by their YYYY-MM-DD prefix, for archiving
+        self._by_date: Dict[str, Set[str]] = defaultdict(set)
         self._load()
 
     def _load(self) -> None:
-        """Load watched state from file."""
+        """Load watched state from file.
+
+        Raises:
+            storage.StorageError: If the file cannot be read or parsed
+        """
         if not self.file_path.exists():
             return
 
+        # Saves are atomic, so a bad file is a real problem rather than a
+        # torn write; report it instead of silently dropping watched history
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            self.watched_keys = set(data.get("watched", []))
-        except (json.JSONDecodeError, IOError) as e:
-            # If file is corrupted, start fresh
-            print(f"Warning: Could not load watched state: {e}")
-            self.watched_keys = set()
+            data = jsonio.loads(self.file_path.read_bytes())
+        except json.JSONDecodeError as e:
+            raise storage.StorageError(f"Invalid JSON in {self.file_path}: {e}")
+        except IOError as e:
+            raise storage.StorageError(f"Cannot read file {self.file_path}: {e}")
+
+        self.watched_keys = set(data.get("watched", []))
+        for key_str in self.watched_keys:
+            self._by_date[key_str[:10]].add(key_str)
 
     def _save(self) -> None:
         """Save watched state to file."""
-        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        content = jsonio.dumps({"watched": sorted(self.watched_keys)}, indent=True)
 
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump({"watched": sorted(list(self.watched_keys))}, f, indent=2)
+            storage.write_atomic(self.file_path, content)
         except IOError as e:
             print(f"Warning: Could not save watched state: {e}")
 
@@ -116,14 +134,20 @@ class WatchedState:
         Returns:
             Number of notifications marked
         """
-        initial_count = len(self.watched_keys)
+        added = 0
 
         for key in keys:
-            self.watched_keys.add(key.to_string())
-
-        self._save()
+            key_str = key.to_string()
+            if key_str not in self.watched_keys:
+                self.watched_keys.add(key_str)
+                self._by_date[key_str[:10]].add(key_str)
+                added += 1
+
+        # Nothing new means the file already matches; skip the sort and write
+        if added:
+            self._save()
 
-        return len(self.watched_keys) - initial_count
+        return added
 
     def is_watched(self, key: NotificationKey) -> bool:
         """Check if notification is watched.
@@ -157,32 +181,21 @@ class WatchedState:
             return 0
 
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        initial_count = len(self.watched_keys)
-
-        # Filter out old watched notifications
-        self.watched_keys = {
-            key for key in self.watched_keys
-            if self._extract_date_from_key(key) >= cutoff_date
-        }
 
-        if len(self.watched_keys) < initial_count:
-            self._save()
+        # Whole date buckets expire at once, so only the dates are scanned
+        expired_dates = [day for day in self._by_date if day < cutoff_date]
+        if not expired_dates:
+            return 0
 
-        return initial_count - len(self.watched_keys)
+        archived = 0
+        for day in expired_dates:
+            expired = self._by_date.pop(day)
+            self.watched_keys.difference_update(expired)
+            archived += len(expired)
 
-    def _extract_date_from_key(self, key_str: str) -> str:
-        """Extract date from notification key string.
+        self._save()
 
-        Args:
-            key_str: Notification key string
-
-        Returns:
-            Date string (YYYY-MM-DD)
-        """
-        try:
-            return key_str.split('|')[0]
-        except IndexError:
-            return "9999-12-31"  # Future date for invalid keys
+        return archived
 
 
 def filter_unwatched_notifications(
@@ -199,15 +212,20 @@ def filter_unwatched_notifications(
         List of unwatched notification lines
     """
     unwatched = []
+    watched = watched_state.watched_keys
 
+    # Build the key string straight from the split fields, skipping the
+    # NotificationKey round trip done by from_notification_line + is_watched
     for line in notifications:
-        try:
-            key = NotificationKey.from_notification_line(line)
-            if not watched_state.is_watched(key):
-                unwatched.append(line)
-        except ValueError:
+        parts = line.split('|', 3)
+        if len(parts) < 3:
             # If we can't parse the line, include it anyway
             unwatched.append(line)
+            continue
+
+        key_str = f"{parts[0].strip()}|{parts[1].strip()}|{parts[2].strip()}"
+        if key_str not in watched:
+            unwatched.append(line)
 
     return unwatched
 
@@ -236,7 +254,9 @@ def parse_notification_indices(
     if input_str == "all":
         return list(range(max_index))
 
-    indices = []
+    # One flag per valid index: duplicates collapse for free and the
+    # result comes out sorted without building a set or sorting
+    selected = bytearray(max_index)
 
     # Split by comma
     for part in input_str.split(','):
@@ -252,7 +272,7 @@ def parse_notification_indices(
                 if start_idx < 0 or end_idx >= max_index or start_idx > end_idx:
                     raise ValueError(f"Invalid range: {part}")
 
-                indices.extend(range(start_idx, end_idx + 1))
+                selected[start_idx:end_idx + 1] = b'\x01' * (end_idx - start_idx + 1)
             except ValueError as e:
                 raise ValueError(f"Invalid range format: {part}") from e
         else:
@@ -261,9 +281,8 @@ def parse_notification_indices(
                 idx = int(part) - 1  # Convert to 0-based
                 if idx < 0 or idx >= max_index:
                     raise ValueError(f"Index out of range: {part}")
-                indices.append(idx)
+                selected[idx] = 1
             except ValueError as e:
                 raise ValueError(f"Invalid number: {part}") from e
 
-    # Remove duplicates and sort
-    return sorted(list(set(indices)))
+    return [i for i, flag in enumerate(selected) if flag]
@@ -0,0 +1,110 @@
+"""Shared pytest fixtures."""
+
+import os
+import shutil
+import uuid
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+
+# Import the modules most test files use once, up front, so per-file
+# imports during collection are sys.modules lookups
+import episode_owl.utils  # noqa: F401
+import episode_owl.watched  # noqa: F401
+from episode_owl import api, storage
+from episode_owl.config import Config
+from episode_owl.tracker import Episode
+
+
+# RAM-backed filesystem on most Linux systems
+_SHM = Path("/dev/shm")
+
+
+@pytest.fixture
+def fast_tmp_path(tmp_path_factory):
+    """Temporary directory on tmpfs when available, for write-heavy tests.
+
+    Falls back to a regular pytest temporary directory where /dev/shm
+    doesn't exist (macOS, Windows). Directories are unique per xdist
+    worker and test, and removed afterwards.
+    """
+    if not _SHM.is_dir() or not os.access(_SHM, os.W_OK):
+        yield tmp_path_factory.mktemp("eo", numbered=True)
+        return
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    path = _SHM / f"eo-{worker}-{uuid.uuid4().hex}"
+    path.mkdir()
+
+    yield path
+
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Start every test with cold module-level caches and a full rate limiter.
+
+    Keeps results independent of test order, including across xdist workers.
+    """
+    api._SEARCH_CACHE.clear()
+    api._CACHE = None
+    api._BUCKET = api.TokenBucket()
+    storage._NOTIF_CACHE.clear()
+    yield
+    if api._CACHE is not None:
+        api._CACHE.close()
+    api._CACHE = None
+
+
+@pytest.fixture(autouse=True)
+def no_fsync(request, monkeypatch):
+    """Turn fsync/sync into no-ops, since most tests don't check durability.
+
+    Tests marked ``fsync`` keep the real calls.
+    """
+    if request.node.get_closest_marker("fsync"):
+        return
+
+    monkeypatch.setattr(os, "fsync", lambda fd: None)
+    monkeypatch.setattr(os, "fdatasync", lambda fd: None, raising=False)
+    monkeypatch.setattr(os, "sync", lambda: None, raising=False)
+
+
+@pytest.fixture(scope="session")
+def default_config():
+    """Default configuration, shared by every test that only reads it."""
+    return Config()
+
+
+@pytest.fixture(scope="session")
+def sample_episode():
+    """A regular, already aired episode (immutable, so safe to share)."""
+    return Episode(season=1, number=5, title="Test", airdate="2025-11-01")
+
+
+@pytest.fixture(scope="session")
+def breaking_bad_episodes():
+    """TVMaze episode list for the first three Breaking Bad episodes.
+
+    Read-only views, so a test can't change the data other tests see.
+    """
+    return tuple(MappingProxyType(episode) for episode in [
+        {"season": 1, "number": 1, "name": "Pilot", "airdate": "2008-01-20"},
+        {"season": 1, "number": 2, "name": "Cat's in the Bag...", "airdate": "2008-01-27"},
+        {"season": 1, "number": 3, "name": "...And the Bag's in the River", "airdate": "2008-02-10"},
+    ])
+
+
+@pytest.fixture(scope="session")
+def breaking_bad_search_results():
+    """TVMaze search results containing only Breaking Bad (read-only)."""
+    return (MappingProxyType({
+        "show": MappingProxyType({
+            "id": 123,
+            "name": "Breaking Bad",
+            "premiered": "2008-01-20",
+            "status": "Ended"
+        })
+    }),)
@@ -1,25 +1,33 @@
 """Tests for api module."""
 
+import json
+import threading
+from concurrent.futures import Future
 import pytest
 import requests
 from unittest.mock import Mock, patch
 
+from episode_owl import api
 from episode_owl.api import (
+    _SESSION,
     TVMazeAPIError,
     NetworkError,
     search_shows,
     get_show_episodes,
+    iter_fetched_episodes,
     get_show_by_id,
+    enable_cache,
+    TokenBucket,
 )
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
 def test_search_shows_success(mock_get):
     """Test successful show search."""
     mock_response = Mock()
-    mock_response.json.return_value = [
+    mock_response.content = json.dumps([
         {"show": {"id": 1, "name": "Test Show"}}
-    ]
+    ]).encode()
     mock_response.raise_for_status = Mock()
     mock_get.return_value = mock_response
 
@@ -30,7 +38,22 @@ def test_search_shows_success(mock_get):
     mock_get.assert_called_once()
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
+def test_search_shows_max_results(mock_get):
+    """Test that search results are capped to max_results."""
+    mock_response = Mock()
+    mock_response.content = json.dumps([
+        {"show": {"id": i, "name": f"Show {i}"}} for i in range(10)
+    ]).encode()
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    results = search_shows("show", max_results=3)
+
+    assert [r["show"]["id"] for r in results] == [0, 1, 2]
+
+
+@patch('episode_owl.api._SESSION.get')
 def test_search_shows_timeout(mock_get):
     """Test search with timeout."""
     mock_get.side_effect = requests.Timeout()
@@ -41,7 +64,7 @@ def test_search_shows_timeout(mock_get):
     assert "timed out" in str(exc_info.value).lower()
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
 def test_search_shows_network_error(mock_get):
     """Test search with network error."""
     mock_get.side_effect = requests.RequestException("Connection failed")
@@ -50,11 +73,11 @@ def test_search_shows_network_error(mock_get):
         search_shows("test")
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
 def test_search_shows_invalid_json(mock_get):
     """Test search with invalid JSON response."""
     mock_response = Mock()
-    mock_response.json.side_effect = ValueError("Invalid JSON")
+    mock_response.content = b"{ invalid json }"
     mock_response.raise_for_status = Mock()
     mock_get.return_value = mock_response
 
@@ -62,14 +85,14 @@ def test_search_shows_invalid_json(mock_get):
         search_shows("test")
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
 @patch('episode_owl.api.time.sleep')
 def test_get_show_episodes_success(mock_sleep, mock_get):
     """Test getting show episodes successfully."""
     mock_response = Mock()
-    mock_response.json.return_value = [
+    mock_response.content = json.dumps([
         {"id": 1, "season": 1, "number": 1, "name": "Pilot"}
-    ]
+    ]).encode()
     mock_response.raise_for_status = Mock()
     mock_get.return_value = mock_response
 
@@ -79,7 +102,40 @@ def test_get_show_episodes_success(mock_sleep, mock_get):
     assert episodes[0]["name"] == "Pilot"
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
+@patch('episode_owl.api.time.sleep')
+def test_get_show_episodes_drops_unused_fields(mock_sleep, mock_get):
+    """Test that episode records are reduced to the fields we use."""
+    mock_response = Mock()
+    mock_response.content = json.dumps([
+        {
+            "id": 1,
+            "season": 1,
+            "number": 1,
+            "name": "Pilot",
+            "airdate": "2008-01-20",
+            "type": "regular",
+            "summary": "<p>A long HTML summary</p>",
+            "image": {"medium": "https://example.com/1.jpg"},
+            "_links": {"self": {"href": "https://api.tvmaze.com/episodes/1"}},
+        }
+    ]).encode()
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    episodes = get_show_episodes(123)
+
+    assert episodes == [{
+        "id": 1,
+        "season": 1,
+        "number": 1,
+        "name": "Pilot",
+        "airdate": "2008-01-20",
+        "type": "regular",
+    }]
+
+
+@patch('episode_owl.api._SESSION.get')
 @patch('episode_owl.api.time.sleep')
 def test_get_show_episodes_404(mock_sleep, mock_get):
     """Test getting episodes for show without episodes."""
@@ -92,7 +148,7 @@ def test_get_show_episodes_404(mock_sleep, mock_get):
     assert episodes == []
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
 @patch('episode_owl.api.time.sleep')
 def test_get_show_episodes_retry(mock_sleep, mock_get):
     """Test retry logic for failed requests."""
@@ -101,7 +157,7 @@ def test_get_show_episodes_retry(mock_sleep, mock_get):
     mock_response_fail.raise_for_status.side_effect = requests.Timeout()
 
     mock_response_success = Mock()
-    mock_response_success.json.return_value = [{"id": 1}]
+    mock_response_success.content = json.dumps([{"id": 1}]).encode()
     mock_response_success.raise_for_status = Mock()
     mock_response_success.status_code = 200
 
@@ -114,7 +170,7 @@ def test_get_show_episodes_retry(mock_sleep, mock_get):
     assert mock_sleep.call_count >= 1  # Should sleep for backoff
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
 @patch('episode_owl.api.time.sleep')
 def test_get_show_episodes_retry_exhausted(mock_sleep, mock_get):
     """Test that retries eventually fail."""
@@ -127,11 +183,171 @@ def test_get_show_episodes_retry_exhausted(mock_sleep, mock_get):
     assert mock_get.call_count == 3
 
 
-@patch('episode_owl.api.requests.get')
+def _http_error(status: int, headers: dict | None = None) -> requests.HTTPError:
+    """Build an HTTPError carrying a response with the given status."""
+    response = Mock()
+    response.status_code = status
+    response.headers = headers or {}
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+@patch('episode_owl.api._SESSION.get')
+@patch('episode_owl.api.time.sleep')
+def test_get_show_episodes_client_error_not_retried(mock_sleep, mock_get):
+    """Test that client errors fail immediately without retrying."""
+    mock_get.side_effect = _http_error(403)
+
+    with pytest.raises(TVMazeAPIError):
+        get_show_episodes(123, retry_attempts=3)
+
+    assert mock_get.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+@patch('episode_owl.api._SESSION.get')
+@patch('episode_owl.api.time.sleep')
+def test_get_show_episodes_honors_retry_after(mock_sleep, mock_get):
+    """Test that a 429 waits for the Retry-After delay."""
+    mock_response_success = Mock()
+    mock_response_success.content = json.dumps([{"id": 1}]).encode()
+    mock_response_success.raise_for_status = Mock()
+    mock_response_success.status_code = 200
+
+    mock_get.side_effect = [_http_error(429, {"Retry-After": "3"}), mock_response_success]
+
+    episodes = get_show_episodes(123, retry_attempts=1)
+
+    assert episodes == [{"id": 1}]
+    mock_sleep.assert_called_once_with(3.0)
+
+
+@patch('episode_owl.api._SESSION.get')
+@patch('episode_owl.api.time.sleep')
+def test_get_show_episodes_backoff_capped(mock_sleep, mock_get):
+    """Test that backoff delays never exceed the cap."""
+    mock_get.side_effect = requests.Timeout()
+
+    with pytest.raises(NetworkError):
+        get_show_episodes(123, retry_attempts=5)
+
+    delays = [c.args[0] for c in mock_sleep.call_args_list]
+    assert len(delays) == 5
+    assert all(0.5 <= d <= api.BACKOFF_CAP for d in delays)
+
+
+@patch('episode_owl.api.get_show_episodes')
+def test_iter_fetched_episodes(mock_get_episodes):
+    """Test fetching episodes for several shows concurrently."""
+    mock_get_episodes.side_effect = lambda show_id, *args: [{"id": show_id}]
+
+    results = dict(iter_fetched_episodes([1, 2, 3], concurrency=2))
+
+    assert set(results) == {1, 2, 3}
+    assert results[2] == [{"id": 2}]
+    assert mock_get_episodes.call_count == 3
+
+
+@patch('episode_owl.api.get_show_episodes')
+def test_iter_fetched_episodes_collects_errors(mock_get_episodes):
+    """Test that a failing show does not abort the other fetches."""
+    def fake_get(show_id, *args):
+        if show_id == 2:
+            raise NetworkError("Connection failed")
+        return [{"id": show_id}]
+
+    mock_get_episodes.side_effect = fake_get
+
+    results = dict(iter_fetched_episodes([1, 2]))
+
+    assert results[1] == [{"id": 1}]
+    assert isinstance(results[2], NetworkError)
+
+
+@patch('episode_owl.api.get_show_episodes')
+def test_iter_fetched_episodes_deduplicates(mock_get_episodes):
+    """Test that a show listed twice is fetched once."""
+    mock_get_episodes.side_effect = lambda show_id, *args: [{"id": show_id}]
+
+    results = dict(iter_fetched_episodes([1, 1, 2]))
+
+    assert set(results) == {1, 2}
+    assert mock_get_episodes.call_count == 2
+
+
+@patch('episode_owl.api.get_show_episodes')
+def test_iter_fetched_episodes_yields_each_show(mock_get_episodes):
+    """Test that results are yielded per show, errors included."""
+    def fake_get(show_id, *args):
+        if show_id == 2:
+            raise TVMazeAPIError("HTTP 500")
+        return [{"id": show_id}]
+
+    mock_get_episodes.side_effect = fake_get
+
+    results = list(iter_fetched_episodes([1, 2, 3], concurrency=2))
+
+    assert sorted(show_id for show_id, _ in results) == [1, 2, 3]
+    by_id = dict(results)
+    assert by_id[3] == [{"id": 3}]
+    assert isinstance(by_id[2], TVMazeAPIError)
+    assert list(iter_fetched_episodes([])) == []
+
+
+@patch('episode_owl.api._SESSION.get')
+def test_get_show_episodes_coalesces_concurrent_requests(mock_get):
+    """Test that concurrent fetches of the same show share one request."""
+    started = threading.Event()
+    release = threading.Event()
+
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.content = json.dumps([{"id": 1}]).encode()
+    mock_response.raise_for_status = Mock()
+
+    def slow_get(*args, **kwargs):
+        started.set()
+        release.wait(timeout=5)
+        return mock_response
+
+    mock_get.side_effect = slow_get
+
+    waiting = threading.Event()
+
+    class SignallingFuture(Future):
+        """Future that reports when a duplicate caller starts waiting."""
+
+        def result(self, timeout=None):
+            waiting.set()
+            return super().result(timeout)
+
+    results = []
+    with patch('episode_owl.api.Future', SignallingFuture):
+        first = threading.Thread(target=lambda: results.append(get_show_episodes(123)))
+        first.start()
+        started.wait(timeout=5)
+
+        second = threading.Thread(target=lambda: results.append(get_show_episodes(123)))
+        second.start()
+        waiting.wait(timeout=5)
+        release.set()
+
+        first.join(timeout=5)
+        second.join(timeout=5)
+
+    assert results == [[{"id": 1}], [{"id": 1}]]
+    mock_get.assert_called_once()
+
+
+def test_iter_fetched_episodes_empty():
+    """Test fetching with no shows."""
+    assert dict(iter_fetched_episodes([])) == {}
+
+
+@patch('episode_owl.api._SESSION.get')
 def test_get_show_by_id_success(mock_get):
     """Test getting show by ID successfully."""
     mock_response = Mock()
-    mock_response.json.return_value = {"id": 123, "name": "Test Show"}
+    mock_response.content = json.dumps({"id": 123, "name": "Test Show"}).encode()
     mock_response.raise_for_status = Mock()
     mock_get.return_value = mock_response
 
@@ -141,7 +357,7 @@ def test_get_show_by_id_success(mock_get):
     assert show["name"] == "Test Show"
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
 def test_get_show_by_id_not_found(mock_get):
     """Test getting show that doesn't exist."""
     mock_response = Mock()
@@ -153,10 +369,163 @@ def test_get_show_by_id_not_found(mock_get):
     assert show is None
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
 def test_get_show_by_id_timeout(mock_get):
     """Test getting show with timeout."""
     mock_get.side_effect = requests.Timeout()
 
     with pytest.raises(NetworkError):
         get_show_by_id(123)
+
+
+def test_session_is_shared():
+    """Test that the module session is configured for connection reuse."""
+    adapter = _SESSION.get_adapter("https://api.tvmaze.com")
+
+    assert adapter._pool_maxsize == 20
+    assert _SESSION.headers["Accept"] == "application/json"
+
+
+@patch('episode_owl.api._SESSION.close')
+def test_close_releases_session_and_cache(mock_session_close, tmp_path):
+    """Test that close shuts the session and drops the response cache."""
+    enable_cache(tmp_path / "cache.sqlite3")
+
+    api.close()
+
+    mock_session_close.assert_called_once()
+    assert api._CACHE is None
+
+
+def test_enable_cache_corrupt_database(tmp_path, caplog):
+    """Test that an unusable cache database disables caching instead of failing."""
+    db_path = tmp_path / "cache.sqlite3"
+    db_path.write_bytes(b"not a database" * 100)
+
+    enable_cache(db_path)
+
+    assert api._CACHE is None
+    assert "continuing without it" in caplog.text
+
+
+@patch('episode_owl.api._SESSION.get')
+def test_search_shows_memoized(mock_get):
+    """Test repeated searches within the TTL reuse the first result."""
+    mock_response = Mock()
+    mock_response.content = json.dumps([{"show": {"id": 1, "name": "Test Show"}}]).encode()
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    first = search_shows("test")
+    second = search_shows("test")
+
+    assert first == second
+    mock_get.assert_called_once()
+
+    # Each call gets its own result objects
+    first[0]["show"]["name"] = "Changed"
+    assert search_shows("test")[0]["show"]["name"] == "Test Show"
+
+
+@patch('episode_owl.api.time.monotonic')
+def test_search_cache_is_bounded(mock_monotonic):
+    """Test that the search memo drops expired entries and stays under its size."""
+    mock_monotonic.return_value = 0.0
+    api._remember_search("old", b"[]")
+
+    mock_monotonic.return_value = api.SEARCH_CACHE_TTL + 1
+    for i in range(api.SEARCH_CACHE_SIZE + 5):
+        api._remember_search(f"query {i}", b"[]")
+
+    assert len(api._SEARCH_CACHE) == api.SEARCH_CACHE_SIZE
+    assert "old" not in api._SEARCH_CACHE
+    assert "query 0" not in api._SEARCH_CACHE
+    assert f"query {api.SEARCH_CACHE_SIZE + 4}" in api._SEARCH_CACHE
+
+
+@patch('episode_owl.api._SESSION.get')
+@patch('episode_owl.api.time.sleep')
+def test_get_show_episodes_not_modified_uses_cache(mock_sleep, mock_get, tmp_path):
+    """Test that a 304 response returns the cached episode list."""
+    enable_cache(tmp_path / "cache.sqlite3")
+
+    fresh = Mock()
+    fresh.status_code = 200
+    fresh.headers = {"ETag": '"abc"'}
+    fresh.content = json.dumps([{"id": 1, "season": 1, "number": 1}]).encode()
+    fresh.raise_for_status = Mock()
+
+    not_modified = Mock()
+    not_modified.status_code = 304
+
+    mock_get.side_effect = [fresh, not_modified]
+
+    assert get_show_episodes(123) == [{"id": 1, "season": 1, "number": 1}]
+    assert get_show_episodes(123) == [{"id": 1, "season": 1, "number": 1}]
+
+    # Both requests hit the same endpoint URL, which is also the cache key
+    assert mock_get.call_args_list[0].args[0] == "https://api.tvmaze.com/shows/123/episodes"
+    assert mock_get.call_args_list[1].args[0] == "https://api.tvmaze.com/shows/123/episodes"
+
+    # Second request should carry the stored validator
+    second_headers = mock_get.call_args_list[1].kwargs["headers"]
+    assert second_headers["If-None-Match"] == '"abc"'
+
+
+@patch('episode_owl.api._SESSION.get')
+def test_get_show_episodes_fresh_cache_skips_request(mock_get, tmp_path):
+    """Test that a cache entry younger than max_age is used without a request."""
+    enable_cache(tmp_path / "cache.sqlite3")
+
+    fresh = Mock()
+    fresh.status_code = 200
+    fresh.headers = {}
+    fresh.content = json.dumps([{"id": 1, "season": 1, "number": 1}]).encode()
+    fresh.raise_for_status = Mock()
+    mock_get.return_value = fresh
+
+    get_show_episodes(123)
+    assert get_show_episodes(123, max_age=3600) == [{"id": 1, "season": 1, "number": 1}]
+    assert mock_get.call_count == 1
+
+    # Without max_age the entry is revalidated
+    get_show_episodes(123)
+    assert mock_get.call_count == 2
+
+
+@patch('episode_owl.api.time.sleep')
+def test_token_bucket_allows_burst(mock_sleep):
+    """Test that requests up to capacity don't wait."""
+    bucket = TokenBucket(capacity=3, refill_rate=1.0)
+
+    for _ in range(3):
+        bucket.acquire()
+
+    mock_sleep.assert_not_called()
+
+
+@patch('episode_owl.api.time.monotonic')
+@patch('episode_owl.api.time.sleep')
+def test_token_bucket_throttles_when_empty(mock_sleep, mock_monotonic):
+    """Test that an empty bucket sleeps until a token refills."""
+    mock_monotonic.return_value = 100.0
+    bucket = TokenBucket(capacity=1, refill_rate=2.0)
+
+    bucket.acquire()
+    bucket.acquire()
+
+    mock_sleep.assert_called_once_with(0.5)
+
+
+@patch('episode_owl.api.time.monotonic')
+@patch('episode_owl.api.time.sleep')
+def test_token_bucket_refills_over_time(mock_sleep, mock_monotonic):
+    """Test that tokens refill with elapsed time."""
+    mock_monotonic.return_value = 100.0
+    bucket = TokenBucket(capacity=1, refill_rate=2.0)
+    bucket.acquire()
+
+    mock_monotonic.return_value = 101.0
+    bucket.acquire()
+
+    mock_sleep.assert_not_called()
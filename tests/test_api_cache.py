@@ -0,0 +1,88 @@
+"""Tests for api_cache module."""
+
+import sqlite3
+import time
+
+import pytest
+
+from episode_owl.api_cache import CachedResponse, ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Response cache backed by a temporary database."""
+    response_cache = ResponseCache(tmp_path / "cache.sqlite3")
+    yield response_cache
+    response_cache.close()
+
+
+def test_get_missing(cache):
+    """Test looking up a URL that was never cached."""
+    assert cache.get("https://api.tvmaze.com/shows/1") is None
+
+
+def test_put_and_get(cache):
+    """Test storing and retrieving a response."""
+    url = "https://api.tvmaze.com/shows/1/episodes"
+    data = [{"id": 1, "name": "Pilot"}]
+
+    cache.put(url, '"etag"', "Wed, 05 Nov 2025 10:00:00 GMT", data)
+
+    cached = cache.get(url)
+
+    assert cached._replace(fetched_at=0.0) == CachedResponse(
+        etag='"etag"',
+        last_modified="Wed, 05 Nov 2025 10:00:00 GMT",
+        data=data
+    )
+    assert cached.fetched_at == pytest.approx(time.time(), abs=60)
+
+
+def test_put_replaces_existing(cache):
+    """Test that storing a URL again replaces the old entry."""
+    url = "https://api.tvmaze.com/shows/1"
+
+    cache.put(url, '"v1"', None, {"name": "Old"})
+    cache.put(url, '"v2"', None, {"name": "New"})
+
+    cached = cache.get(url)
+
+    assert cached.etag == '"v2"'
+    assert cached.data == {"name": "New"}
+
+
+def test_cache_persists(tmp_path):
+    """Test that cached entries survive reopening the database."""
+    db_path = tmp_path / "nested" / "cache.sqlite3"
+    url = "https://api.tvmaze.com/shows/1"
+
+    first = ResponseCache(db_path)
+    first.put(url, '"etag"', None, {"id": 1})
+    first.close()
+
+    second = ResponseCache(db_path)
+    cached = second.get(url)
+    second.close()
+
+    assert cached is not None
+    assert cached.data == {"id": 1}
+
+
+def test_touch_refreshes_fetch_time(cache):
+    """Test that touching an entry marks it as freshly fetched."""
+    url = "https://api.tvmaze.com/shows/1/episodes"
+    cache.put(url, '"etag"', None, [])
+    cache._conn.execute("UPDATE responses SET fetched_at = 0")
+
+    cache.touch(url)
+
+    assert cache.get(url).fetched_at == pytest.approx(time.time(), abs=60)
+
+
+def test_corrupt_database_raises(tmp_path):
+    """Test that a file that isn't a SQLite database is reported on open."""
+    db_path = tmp_path / "cache.sqlite3"
+    db_path.write_bytes(b"not a database" * 100)
+
+    with pytest.raises(sqlite3.DatabaseError):
+        ResponseCache(db_path)
@@ -1,16 +1,16 @@
 """Tests for config module."""
 
-import json
 from pathlib import Path
 
 import pytest
 
+from episode_owl import jsonio
 from episode_owl.config import Config, load_config, save_config, get_default_paths
 
 
-def test_config_defaults():
+def test_config_defaults(default_config):
     """Test default configuration values."""
-    config = Config()
+    config = default_config
 
     assert config.output_path == "data/notifications.txt"
     assert config.date_format == "%Y-%m-%d"
@@ -19,15 +19,14 @@ def test_config_defaults():
     assert config.retry_attempts == 1
 
 
-def test_load_config_nonexistent(tmp_path):
+def test_load_config_nonexistent(tmp_path, default_config):
     """Test loading config when file doesn't exist."""
     config_path = tmp_path / "config.json"
 
     config = load_config(config_path)
 
     # Should return defaults
-    assert isinstance(config, Config)
-    assert config.api_timeout == 10
+    assert config == default_config
 
 
 def test_save_and_load_config(tmp_path):
@@ -46,7 +45,7 @@ def test_save_and_load_config(tmp_path):
     # Save it
     save_config(config, config_path)
 
-    assert config_path.exists()
+    assert jsonio.loads(config_path.read_bytes())["api_timeout"] == 20
 
     # Load it back
     loaded = load_config(config_path)
@@ -70,19 +69,42 @@ def test_load_config_malformed(tmp_path):
     assert isinstance(config, Config)
 
 
-def test_load_config_wrong_types(tmp_path):
+def test_load_config_wrong_types(tmp_path, default_config):
     """Test loading config with wrong data types."""
     config_path = tmp_path / "config.json"
 
     # Write config with wrong types
-    config_path.write_text(json.dumps({
+    config_path.write_bytes(jsonio.dumps({
         "api_timeout": "not a number",
         "max_notifications": "also not a number"
     }))
 
     # Should return defaults due to TypeError
     config = load_config(config_path)
-    assert isinstance(config, Config)
+    assert config == default_config
+
+
+@pytest.mark.parametrize("data", [
+    [1, 2, 3],
+    {"api_timeout": True},
+    {"api_timeout": 2.5},
+    {"include_specials": 1},
+    {"auto_open_timeline": "yes"},
+])
+def test_load_config_invalid_values(tmp_path, default_config, data):
+    """Test that non-object configs and mistyped settings fall back to defaults."""
+    config_path = tmp_path / "config.json"
+    config_path.write_bytes(jsonio.dumps(data))
+
+    assert load_config(config_path) == default_config
+
+
+def test_load_config_ignores_unknown_keys(tmp_path):
+    """Test that unknown keys don't invalidate the rest of the config."""
+    config_path = tmp_path / "config.json"
+    config_path.write_bytes(jsonio.dumps({"api_timeout": 30, "removed_option": "x"}))
+
+    assert load_config(config_path).api_timeout == 30
 
 
 def test_get_default_paths():
@@ -100,3 +122,13 @@ def test_get_default_paths():
     assert paths["shows"].name == "shows.json"
     assert paths["notifications"].name == "notifications.txt"
     assert paths["config"].name == "config.json"
+
+
+def test_get_default_paths_cached_and_read_only():
+    """Test that default paths are built once and can't be modified."""
+    paths = get_default_paths()
+
+    assert get_default_paths() is paths
+
+    with pytest.raises(TypeError):
+        paths["shows"] = Path("elsewhere.json")
@@ -1,49 +1,38 @@
 """Integration tests for Episode Owl."""
 
+import json
 from pathlib import Path
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 
 import pytest
 
-from episode_owl import api, storage, tracker, notifications
+from episode_owl import api, cli, config, storage, tracker, notifications
 
 
-@patch('episode_owl.api.requests.get')
+class _FakeResp:
+    """Minimal stand-in for requests.Response, much cheaper than a Mock."""
+
+    __slots__ = ("content", "status_code", "headers")
+
+    def __init__(self, payload, status_code=200):
+        # Fixtures hold read-only MappingProxyType views; encode them as dicts
+        self.content = json.dumps(payload, default=dict).encode()
+        self.status_code = status_code
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+@patch('episode_owl.api._SESSION.get')
 @patch('episode_owl.api.time.sleep')
-def test_add_show_workflow(mock_sleep, mock_get, tmp_path):
+def test_add_show_workflow(
+    mock_sleep, mock_get, fast_tmp_path, breaking_bad_search_results, breaking_bad_episodes
+):
     """Test the complete workflow of adding a show."""
-    # Mock API search response
-    search_response = Mock()
-    search_response.json.return_value = [
-        {
-            "show": {
-                "id": 123,
-                "name": "Breaking Bad",
-                "premiered": "2008-01-20",
-                "status": "Ended"
-            }
-        }
-    ]
-    search_response.raise_for_status = Mock()
-
-    # Mock API episodes response
-    episodes_response = Mock()
-    episodes_response.json.return_value = [
-        {
-            "season": 1,
-            "number": 1,
-            "name": "Pilot",
-            "airdate": "2008-01-20"
-        },
-        {
-            "season": 1,
-            "number": 2,
-            "name": "Cat's in the Bag...",
-            "airdate": "2008-01-27"
-        }
-    ]
-    episodes_response.raise_for_status = Mock()
-    episodes_response.status_code = 200
+    # Mock API search and episodes responses
+    search_response = _FakeResp(breaking_bad_search_results)
+    episodes_response = _FakeResp(breaking_bad_episodes[:2])
 
     mock_get.side_effect = [search_response, episodes_response]
 
@@ -69,7 +58,7 @@ def test_add_show_workflow(mock_sleep, mock_get, tmp_path):
     show_dict = tracker.create_show_dict(show_id, show_name, latest)
 
     # Save to storage
-    shows_path = tmp_path / "shows.json"
+    shows_path = fast_tmp_path / "shows.json"
     storage.add_show(show_dict, shows_path)
 
     # Verify saved
@@ -79,13 +68,13 @@ def test_add_show_workflow(mock_sleep, mock_get, tmp_path):
     assert shows[0]["last_seen_episode"] == 2
 
 
-@patch('episode_owl.api.requests.get')
+@patch('episode_owl.api._SESSION.get')
 @patch('episode_owl.api.time.sleep')
-def test_check_updates_workflow(mock_sleep, mock_get, tmp_path):
+def test_check_updates_workflow(mock_sleep, mock_get, fast_tmp_path, breaking_bad_episodes):
     """Test the complete workflow of checking for updates."""
     # Setup: Add a show that has seen S01E01
-    shows_path = tmp_path / "shows.json"
-    notif_path = tmp_path / "notifications.txt"
+    shows_path = fast_tmp_path / "shows.json"
+    notif_path = fast_tmp_path / "notifications.txt"
 
     show = {
         "id": 123,
@@ -98,38 +87,18 @@ def test_check_updates_workflow(mock_sleep, mock_get, tmp_path):
     storage.add_show(show, shows_path)
 
     # Mock API response with new episodes
-    episodes_response = Mock()
-    episodes_response.json.return_value = [
-        {
-            "season": 1,
-            "number": 1,
-            "name": "Pilot",
-            "airdate": "2008-01-20"
-        },
-        {
-            "season": 1,
-            "number": 2,
-            "name": "Cat's in the Bag...",
-            "airdate": "2008-01-27"
-        },
-        {
-            "season": 1,
-            "number": 3,
-            "name": "...And the Bag's in the River",
-            "airdate": "2008-02-10"
-        }
-    ]
-    episodes_response.raise_for_status = Mock()
-    episodes_response.status_code = 200
+    episodes_response = _FakeResp(breaking_bad_episodes)
 
     mock_get.return_value = episodes_response
 
-    # Check for updates
+    # Check for updates, fetching all shows concurrently as the CLI does
     shows = storage.load_shows(shows_path)
     updates = []
 
+    fetched = dict(api.iter_fetched_episodes([show_item["id"] for show_item in shows]))
+
     for show_item in shows:
-        episodes_data = api.get_show_episodes(show_item["id"])
+        episodes_data = fetched[show_item["id"]]
         episodes = [tracker.parse_episode_from_api(ep) for ep in episodes_data]
         aired = tracker.filter_aired_episodes(episodes)
 
@@ -170,6 +139,41 @@ def test_check_updates_workflow(mock_sleep, mock_get, tmp_path):
     assert updated_shows[0]["last_seen_episode"] == 3
 
 
+@patch('episode_owl.api._SESSION.get')
+@patch('episode_owl.api.time.sleep')
+def test_check_updates_saves_once(mock_sleep, mock_get, tmp_path):
+    """Test that check_updates writes shows and notifications once per run."""
+    paths = {
+        "shows": tmp_path / "shows.json",
+        "notifications": tmp_path / "notifications.txt",
+        "watched": tmp_path / "watched.json",
+    }
+    storage.save_shows([
+        {"id": 1, "name": "Show A", "last_seen_season": 1, "last_seen_episode": 1},
+        {"id": 2, "name": "Show B", "last_seen_season": 1, "last_seen_episode": 1},
+    ], paths["shows"])
+
+    episodes_response = _FakeResp([
+        {"season": 1, "number": 1, "name": "One", "airdate": "2008-01-20"},
+        {"season": 1, "number": 2, "name": "Two", "airdate": "2008-01-27"},
+    ])
+    mock_get.return_value = episodes_response
+
+    cfg = config.Config(desktop_notifications=False, auto_open_timeline=False)
+
+    with patch('episode_owl.cli.storage.save_shows', wraps=storage.save_shows) as mock_save, \
+            patch('episode_owl.cli.storage.append_notifications',
+                  wraps=storage.append_notifications) as mock_append:
+        cli.check_updates(paths, cfg, no_open=True)
+
+    assert mock_save.call_count == 1
+    assert mock_append.call_count == 1
+
+    shows = storage.load_shows(paths["shows"])
+    assert [s["last_seen_episode"] for s in shows] == [2, 2]
+    assert len(storage.load_notifications(paths["notifications"])) == 2
+
+
 def test_remove_show_workflow(tmp_path):
     """Test the complete workflow of removing a show."""
     shows_path = tmp_path / "shows.json"
@@ -194,9 +198,9 @@ def test_remove_show_workflow(tmp_path):
     assert not any(s["id"] == 2 for s in remaining)
 
 
-def test_notification_timeline_workflow(tmp_path):
+def test_notification_timeline_workflow(fast_tmp_path):
     """Test the complete workflow of managing notification timeline."""
-    notif_path = tmp_path / "notifications.txt"
+    notif_path = fast_tmp_path / "notifications.txt"
 
     # Add some notifications
     notifs1 = [
@@ -226,3 +230,13 @@ def test_notification_timeline_workflow(tmp_path):
     assert len(pruned) == 2
     assert "Show 3" in pruned[0]
     assert "Show 1" in pruned[1]
+
+
+def test_parse_args_commands_are_case_insensitive():
+    """Test that commands are accepted in any case, as before argparse."""
+    args = cli.parse_args(["Check", "--no-open"])
+
+    assert args.command == "check"
+    assert args.no_open is True
+    assert cli.parse_args(["TIMELINE", "5"]).limit == 5
+    assert cli.parse_args([]).command is None
@@ -0,0 +1,54 @@
+"""Tests for jsonio module."""
+
+import json
+
+import pytest
+
+from episode_owl import jsonio
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run a test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_round_trip(backend):
+    """Test that encoded values decode to the same value."""
+    data = {"shows": [{"id": 1, "name": "Café", "last_seen_season": None}]}
+
+    assert jsonio.loads(jsonio.dumps(data)) == data
+    assert jsonio.loads(jsonio.dumps(data, indent=True)) == data
+
+
+def test_dumps_indent_matches_stdlib(backend):
+    """Test that pretty output matches json.dumps(indent=2)."""
+    data = {"id": 1, "name": "Café", "tags": ["a", "b"]}
+
+    expected = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+    assert jsonio.dumps(data, indent=True) == expected
+
+
+def test_loads_accepts_str_and_bytes(backend):
+    """Test decoding from both str and bytes."""
+    assert jsonio.loads('{"a": 1}') == {"a": 1}
+    assert jsonio.loads(b'{"a": 1}') == {"a": 1}
+
+
+def test_loads_invalid(backend):
+    """Test that invalid JSON raises JSONDecodeError."""
+    with pytest.raises(json.JSONDecodeError):
+        jsonio.loads(b"{ invalid json }")
+
+
+def test_dumps_newline(backend):
+    """Test that newline=True appends exactly one trailing newline."""
+    data = {"a": [1, 2]}
+
+    assert jsonio.dumps(data, newline=True) == jsonio.dumps(data) + b"\n"
+    assert jsonio.dumps(data, indent=True, newline=True) == jsonio.dumps(data, indent=True) + b"\n"
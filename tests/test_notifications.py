@@ -1,5 +1,8 @@
 """Tests for notifications module."""
 
+import re
+from unittest.mock import patch
+
 import pytest
 
 from episode_owl.notifications import (
@@ -14,42 +17,37 @@ from episode_owl.notifications import (
 from episode_owl.tracker import Episode, ShowUpdate
 
 
-def test_format_episode_code_standard():
-    """Test formatting standard episode code."""
-    episode = Episode(season=1, number=5, title="Test", airdate="2025-11-01")
-
-    code = format_episode_code(episode)
-
-    assert code == "S01E05"
+@pytest.mark.parametrize("season,number,expected", [
+    (1, 5, "S01E05"),  # Standard
+    (16, 23, "S16E23"),  # Large numbers
+    (None, 42, "E042"),  # Absolute numbering
+])
+def test_format_episode_code(season, number, expected):
+    """Test formatting episode codes."""
+    episode = Episode(season=season, number=number, title="Test", airdate="2025-11-01")
 
+    assert format_episode_code(episode) == expected
 
-def test_format_episode_code_large_numbers():
-    """Test formatting episode code with large numbers."""
-    episode = Episode(season=16, number=23, title="Test", airdate="2025-11-01")
 
-    code = format_episode_code(episode)
+def test_format_episode_code_is_cached(sample_episode):
+    """Test that repeated codes come from the cache."""
+    from episode_owl.notifications import _episode_code
 
-    assert code == "S16E23"
+    _episode_code.cache_clear()
 
+    format_episode_code(sample_episode)
+    format_episode_code(sample_episode._replace(title="Other"))
 
-def test_format_episode_code_absolute():
-    """Test formatting episode code for absolute numbering."""
-    episode = Episode(season=None, number=42, title="Test", airdate="2025-11-01")
+    assert _episode_code.cache_info().hits == 1
 
-    code = format_episode_code(episode)
 
-    assert code == "E042"
-
-
-def test_format_notification():
+def test_format_notification(sample_episode):
     """Test formatting notification line."""
-    episode = Episode(season=1, number=5, title="The Test Episode", airdate="2025-11-01")
-
-    line = format_notification("Breaking Bad", episode, "%Y-%m-%d")
+    line = format_notification("Breaking Bad", sample_episode, "%Y-%m-%d")
 
     assert "Breaking Bad" in line
     assert "S01E05" in line
-    assert "The Test Episode" in line
+    assert sample_episode.title in line
     assert "|" in line
 
 
@@ -87,36 +85,51 @@ def test_format_multiple_notifications():
     assert "Show 2" in lines[1]
 
 
-def test_parse_notification_line_valid():
-    """Test parsing valid notification line."""
-    line = "2025-11-05 | Breaking Bad | S05E16 | Felina"
-
-    parsed = parse_notification_line(line)
-
-    assert parsed is not None
-    assert parsed["date"] == "2025-11-05"
-    assert parsed["show_name"] == "Breaking Bad"
-    assert parsed["episode_code"] == "S05E16"
-    assert parsed["title"] == "Felina"
-
-
-def test_parse_notification_line_invalid():
-    """Test parsing invalid notification line."""
-    line = "This is not a valid notification"
-
-    parsed = parse_notification_line(line)
-
-    assert parsed is None
-
-
-def test_parse_notification_line_with_extra_pipes():
-    """Test parsing notification line with pipes in title."""
-    line = "2025-11-05 | Show | S01E01 | Title | With | Pipes"
-
-    parsed = parse_notification_line(line)
-
-    # Should fail because we expect exactly 4 parts
-    assert parsed is None
+@pytest.mark.parametrize("line,expected", [
+    (
+        "2025-11-05 | Breaking Bad | S05E16 | Felina",
+        {
+            "date": "2025-11-05",
+            "show_name": "Breaking Bad",
+            "episode_code": "S05E16",
+            "title": "Felina",
+        },
+    ),
+    # Padding around fields and the line is removed
+    (
+        "  2025-11-05|Breaking Bad   |  S05E16 | Felina \n",
+        {
+            "date": "2025-11-05",
+            "show_name": "Breaking Bad",
+            "episode_code": "S05E16",
+            "title": "Felina",
+        },
+    ),
+    ("This is not a valid notification", None),
+    # Pipes in the title are rejected: exactly 4 parts are expected
+    ("2025-11-05 | Show | S01E01 | Title | With | Pipes", None),
+    # Dates follow the configurable date_format, so they aren't forced to ISO
+    (
+        "05/11/2025 | Show | E042 | Title",
+        {
+            "date": "05/11/2025",
+            "show_name": "Show",
+            "episode_code": "E042",
+            "title": "Title",
+        },
+    ),
+])
+def test_parse_notification_line(line, expected):
+    """Test parsing notification lines."""
+    assert parse_notification_line(line) == expected
+
+
+def test_parse_notification_line_uses_precompiled_pattern():
+    """Test that the line pattern is compiled once at import."""
+    line_re = parse_notification_line.__globals__["_LINE_RE"]
+
+    assert isinstance(line_re, re.Pattern)
+    assert line_re.pattern
 
 
 def test_format_show_list_entry():
@@ -185,3 +198,22 @@ def test_format_timeline_entry_invalid():
 
     # Should return original line
     assert formatted == line
+
+
+@pytest.mark.parametrize("line", [
+    "2025-11-05 | Show | S01E01 | Title | With | Pipes",
+    "2025-11-05 | Show | S01E01",
+])
+def test_format_timeline_entry_rejects_wrong_field_count(line):
+    """Test that lines without exactly four fields are returned unparsed."""
+    with patch("episode_owl.notifications.parse_notification_line") as mock_parse:
+        assert format_timeline_entry(line) == line
+
+    mock_parse.assert_not_called()
+
+
+def test_format_timeline_entry_custom_date_format():
+    """Test that non-ISO dates are still formatted."""
+    formatted = format_timeline_entry("05/11/2025 | Breaking Bad | S05E16 | Felina")
+
+    assert formatted == "[05/11/2025] Breaking Bad - S05E16: Felina"
@@ -13,16 +13,34 @@ from episode_owl.notifier import (
 from episode_owl.tracker import Episode, ShowUpdate
 
 
+# Episodes are immutable tuples, so one instance can back many updates
+PILOT_EP = Episode(1, 1, "Pilot", "2025-11-01")
+
+
+class _Sink:
+    """Records positional arguments of each call; a lightweight Mock stand-in."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append(args)
+
+
+@pytest.fixture(autouse=True)
+def clear_support_cache():
+    """Re-probe notification backends in every test, since tests patch them."""
+    is_notification_supported.cache_clear()
+    yield
+    is_notification_supported.cache_clear()
+
+
 def test_send_desktop_notification_with_updates(tmp_path):
     """Test sending notification with new episodes."""
     notif_file = tmp_path / "notifications.txt"
 
     updates = [
-        ShowUpdate(
-            show_id=1,
-            show_name="Show 1",
-            episode=Episode(1, 1, "Pilot", "2025-11-01")
-        ),
+        ShowUpdate(show_id=1, show_name="Show 1", episode=PILOT_EP),
         ShowUpdate(
             show_id=2,
             show_name="Show 2",
@@ -30,14 +48,15 @@ def test_send_desktop_notification_with_updates(tmp_path):
         ),
     ]
 
-    with patch('episode_owl.notifier._send_notification') as mock_send:
+    sink = _Sink()
+    with patch('episode_owl.notifier._send_notification', sink):
         send_desktop_notification(updates, notif_file)
 
-        mock_send.assert_called_once()
-        args = mock_send.call_args[0]
-        assert "2 new episodes" in args[0]  # title
-        assert "Show 1" in args[1]  # message
-        assert "Show 2" in args[1]
+    assert len(sink.calls) == 1
+    title, message, *_ = sink.calls[0]
+    assert "2 new episodes" in title
+    assert "Show 1" in message
+    assert "Show 2" in message
 
 
 def test_send_desktop_notification_with_many_shows(tmp_path):
@@ -45,55 +64,59 @@ def test_send_desktop_notification_with_many_shows(tmp_path):
     notif_file = tmp_path / "notifications.txt"
 
     updates = [
-        ShowUpdate(
-            show_id=i,
-            show_name=f"Show {i}",
-            episode=Episode(1, 1, "Pilot", "2025-11-01")
-        )
+        ShowUpdate(show_id=i, show_name=f"Show {i}", episode=PILOT_EP)
         for i in range(5)
     ]
 
-    with patch('episode_owl.notifier._send_notification') as mock_send:
+    sink = _Sink()
+    with patch('episode_owl.notifier._send_notification', sink):
         send_desktop_notification(updates, notif_file)
 
-        mock_send.assert_called_once()
-        args = mock_send.call_args[0]
-        assert "5 new episodes" in args[0]
-        # Should show top 3 + "and 2 more"
-        assert "Show 0" in args[1]
-        assert "Show 1" in args[1]
-        assert "Show 2" in args[1]
-        assert "2 more" in args[1]
+    assert len(sink.calls) == 1
+    title, message, *_ = sink.calls[0]
+    assert "5 new episodes" in title
+    # Should show top 3 + "and 2 more"
+    assert "Show 0" in message
+    assert "Show 1" in message
+    assert "Show 2" in message
+    assert "2 more" in message
 
 
 def test_send_desktop_notification_no_updates(tmp_path):
     """Test sending notification when no new episodes."""
     notif_file = tmp_path / "notifications.txt"
 
-    with patch('episode_owl.notifier._send_notification') as mock_send:
+    sink = _Sink()
+    with patch('episode_owl.notifier._send_notification', sink):
         send_desktop_notification([], notif_file)
 
-        mock_send.assert_called_once()
-        args = mock_send.call_args[0]
-        assert "No new episodes" in args[1]
+    assert len(sink.calls) == 1
+    _, message, *_ = sink.calls[0]
+    assert "No new episodes" in message
 
 
-@patch('episode_owl.notifier.sys.platform', 'win32')
-@patch('episode_owl.notifier._send_windows_toast')
-def test_send_notification_windows(mock_toast):
-    """Test sending notification on Windows."""
-    _send_notification("Title", "Message", "", False)
+@pytest.fixture(params=[
+    ("win32", "_send_windows_toast"),
+    ("linux", "_send_plyer_notification"),
+], ids=["windows", "plyer"])
+def platform_backend(request, monkeypatch):
+    """Pretend to run on a platform and stub the backend it should use."""
+    platform, backend = request.param
+    monkeypatch.setattr('episode_owl.notifier.sys.platform', platform)
 
-    mock_toast.assert_called_once()
+    mock_backend = Mock()
+    monkeypatch.setattr(f'episode_owl.notifier.{backend}', mock_backend)
 
+    return platform, mock_backend
+
+
+def test_send_notification_uses_platform_backend(platform_backend):
+    """Test that Windows uses toast and other systems fall back to plyer."""
+    _, mock_backend = platform_backend
 
-@patch('episode_owl.notifier.sys.platform', 'linux')
-@patch('episode_owl.notifier._send_plyer_notification')
-def test_send_notification_fallback_to_plyer(mock_plyer):
-    """Test fallback to plyer on non-Windows systems."""
     _send_notification("Title", "Message", "", False)
 
-    mock_plyer.assert_called_once()
+    mock_backend.assert_called_once()
 
 
 @patch('episode_owl.notifier.sys.platform', 'win32')
@@ -139,3 +162,15 @@ def test_is_notification_supported_none():
         result = is_notification_supported()
         # May be True or False depending on actual system
         assert isinstance(result, bool)
+
+
+def test_is_notification_supported_cached():
+    """Test that backend probing happens once until the cache is cleared."""
+    with patch.dict('sys.modules', {'plyer': Mock()}):
+        assert is_notification_supported() is True
+
+    with patch.dict('sys.modules', {'plyer': None, 'win10toast_click': None}):
+        assert is_notification_supported() is True
+
+        is_notification_supported.cache_clear()
+        assert is_notification_supported() is False
@@ -1,6 +1,7 @@
 """Tests for search module."""
 
 import pytest
+from rapidfuzz import fuzz
 
 from episode_owl.search import (
     SearchResult,
@@ -110,6 +111,22 @@ def test_rank_search_results_limit():
     assert len(results) == 3
 
 
+def test_rank_search_results_large():
+    """Test ranking a large result set keeps only the best matches, in order."""
+    api_results = [
+        {"show": {"id": i, "name": f"Synthetic {i:05d}", "status": "Running"}}
+        for i in range(10_000)
+    ]
+    api_results.append({"show": {"id": 99_999, "name": "Breaking Bad", "premiered": "2008-01-20"}})
+
+    results = rank_search_results("breaking bad", api_results, limit=5)
+
+    assert len(results) == 5
+    assert results[0].show_id == 99_999
+    assert results[0].year == 2008
+    assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+
+
 def test_rank_search_results_no_year():
     """Test ranking results without premiere date."""
     api_results = [
@@ -128,6 +145,30 @@ def test_rank_search_results_no_year():
     assert results[0].year is None
 
 
+def test_rank_search_results_scores_case_insensitively():
+    """Test that batch scoring matches a per-name casefolded ratio."""
+    api_results = [
+        {"show": {"id": 1, "name": "Attack on Titan"}},
+        {"show": {"id": 2, "name": "ATTACK"}},
+        {"show": {"id": 3, "name": "Titan"}},
+    ]
+
+    results = rank_search_results("attack on titan", api_results)
+
+    for result in results:
+        assert result.score == fuzz.ratio("attack on titan", result.name.casefold())
+    assert results[0].show_id == 1
+
+
+def test_rank_search_results_casefolds():
+    """Test that matching folds case beyond ASCII lowercasing."""
+    api_results = [{"show": {"id": 1, "name": "STRASSE"}}]
+
+    results = rank_search_results("straße", api_results)
+
+    assert results[0].score == 100.0
+
+
 def test_find_show_by_name_exact_match():
     """Test finding show by exact name match."""
     shows = [
@@ -167,6 +208,25 @@ def test_find_show_by_name_fuzzy_match():
     assert show_id == 1
 
 
+def test_find_show_by_name_ignores_case():
+    """Test that matching tracked shows ignores case."""
+    shows = [
+        {"id": 1, "name": "THE OFFICE"},
+        {"id": 2, "name": "Parks and Recreation"},
+    ]
+
+    assert find_show_by_name("the office", shows, threshold=95.0) == 1
+
+
+def test_find_show_by_name_large():
+    """Test matching against a large watchlist."""
+    shows = [{"id": i, "name": f"Synthetic Show {i:05d}"} for i in range(10_000)]
+    shows.append({"id": 99_999, "name": "Breaking Bad"})
+
+    assert find_show_by_name("breaking bad", shows, threshold=90.0) == 99_999
+    assert find_show_by_name("totally different", shows, threshold=90.0) is None
+
+
 def test_find_show_by_name_no_match():
     """Test finding show when there's no good match."""
     shows = [
@@ -221,3 +281,4 @@ def test_format_search_result_no_year():
     assert "New Show" in formatted
     assert "[Running]" in formatted
     assert "()" not in formatted  # No empty parentheses
+    assert formatted == "2. New Show [Running] (Match: 85%)"
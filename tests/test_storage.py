@@ -1,12 +1,16 @@
 """Tests for storage module."""
 
 import json
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from episode_owl import jsonio, storage
 from episode_owl.storage import (
     StorageError,
+    ShowStore,
     load_shows,
     save_shows,
     add_show,
@@ -18,19 +22,71 @@ from episode_owl.storage import (
 )
 
 
-def test_load_shows_nonexistent(tmp_path):
-    """Test loading shows when file doesn't exist."""
-    shows_path = tmp_path / "shows.json"
+# First line of files in the append-only order
+_HEADER = storage._TIMELINE_HEADER_LINE
+
+# Fixed notification file contents; without the header, newest entry first
+_DATED_LINES = (
+    b"2025-11-05 | Show 1 | S01E01 | Pilot\n"
+    b"2025-11-04 | Show 2 | S02E05 | Episode 5\n"
+    b"\n"  # Empty line
+    b"2025-11-03 | Show 3 | S01E10 | Finale\n"
+)
+# Append-only order: newest entry last
+_FIVE_LINES = _HEADER + b"Line 5\nLine 4\nLine 3\nLine 2\nLine 1\n"
+_OLD_LINES = _HEADER + b"Old 2\nOld 1\n"
+
+
+@pytest.fixture
+def shows_path(fast_tmp_path):
+    """Path of a shows file in a fresh directory."""
+    return fast_tmp_path / "shows.json"
+
+
+@pytest.fixture
+def notif_path(fast_tmp_path):
+    """Path of a notifications file in a fresh directory."""
+    return fast_tmp_path / "notifications.txt"
+
+
+def _seed_shows(shows_path: Path, shows: list) -> None:
+    """Write a shows file directly, for tests where saving isn't under test."""
+    shows_path.write_bytes(jsonio.dumps({"shows": shows}))
+
+
+def _raw_lines(path: Path) -> list[str]:
+    """Entry lines of a timeline file in on-disk order, bypassing load_notifications.
+
+    Also checks that the file starts with the append-only order header.
+    """
+    header, *lines = [line for line in path.read_bytes().decode("utf-8").split("\n") if line]
+    assert header == storage._TIMELINE_HEADER
+    return lines
+
+
+@pytest.fixture
+def atomic_writes(monkeypatch):
+    """Record the paths replaced through storage.write_atomic."""
+    written = []
+    real_write_atomic = storage.write_atomic
+
+    def recording_write_atomic(file_path, data):
+        written.append(file_path)
+        real_write_atomic(file_path, data)
+
+    monkeypatch.setattr(storage, "write_atomic", recording_write_atomic)
+    return written
 
+
+def test_load_shows_nonexistent(shows_path):
+    """Test loading shows when file doesn't exist."""
     shows = load_shows(shows_path)
 
     assert shows == []
 
 
-def test_save_and_load_shows(tmp_path):
+def test_save_and_load_shows(shows_path):
     """Test saving and loading shows."""
-    shows_path = tmp_path / "shows.json"
-
     shows_data = [
         {"id": 1, "name": "Show 1"},
         {"id": 2, "name": "Show 2"},
@@ -47,9 +103,17 @@ def test_save_and_load_shows(tmp_path):
     assert loaded[1]["name"] == "Show 2"
 
 
-def test_save_shows_creates_directory(tmp_path):
+def test_save_shows_non_ascii(shows_path):
+    """Test that non-ASCII show names round-trip and stay readable JSON."""
+    save_shows([{"id": 1, "name": "Shingeki no Kyojin: 進撃の巨人"}], shows_path)
+
+    assert load_shows(shows_path)[0]["name"] == "Shingeki no Kyojin: 進撃の巨人"
+    assert jsonio.loads(shows_path.read_bytes())["shows"][0]["id"] == 1
+
+
+def test_save_shows_creates_directory(fast_tmp_path):
     """Test that save_shows creates parent directories."""
-    shows_path = tmp_path / "nested" / "dir" / "shows.json"
+    shows_path = fast_tmp_path / "nested" / "dir" / "shows.json"
 
     shows_data = [{"id": 1, "name": "Test"}]
 
@@ -58,10 +122,8 @@ def test_save_shows_creates_directory(tmp_path):
     assert shows_path.exists()
 
 
-def test_save_shows_creates_backup(tmp_path):
-    """Test that save_shows creates backup of existing file."""
-    shows_path = tmp_path / "shows.json"
-
+def test_save_shows_replaces_file(fast_tmp_path, shows_path):
+    """Test that save_shows replaces the file and leaves no temp or backup files."""
     # Create initial file
     shows_data = [{"id": 1, "name": "Original"}]
     save_shows(shows_data, shows_path)
@@ -70,29 +132,67 @@ def test_save_shows_creates_backup(tmp_path):
     new_data = [{"id": 2, "name": "Updated"}]
     save_shows(new_data, shows_path)
 
-    # Backup should exist
-    backup_path = shows_path.with_suffix('.json.bak')
-    assert backup_path.exists()
+    # Only the shows file remains
+    assert [p.name for p in fast_tmp_path.iterdir()] == ["shows.json"]
+
+    # File should have the new data
+    saved_data = jsonio.loads(shows_path.read_bytes())
+    assert saved_data["shows"][0]["name"] == "Updated"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_save_shows_same_bytes_with_and_without_orjson(shows_path, monkeypatch, use_orjson):
+    """Test that shows.json is identical whichever JSON backend writes it."""
+    if use_orjson and jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(jsonio, "orjson", None)
+
+    shows_data = [{"id": 1, "name": "Café", "last_seen_season": None}]
+
+    save_shows(shows_data, shows_path)
+
+    expected = json.dumps({"shows": shows_data}, indent=2, ensure_ascii=False) + "\n"
+    assert shows_path.read_bytes() == expected.encode("utf-8")
+    assert load_shows(shows_path) == shows_data
+
 
-    # Backup should have original data
-    with open(backup_path) as f:
-        backup_data = json.load(f)
-    assert backup_data["shows"][0]["name"] == "Original"
+def test_save_shows_skips_unchanged(shows_path, monkeypatch):
+    """Test that saving identical data leaves the file untouched."""
+    shows_data = [{"id": 1, "name": "Test"}]
+    save_shows(shows_data, shows_path)
+
+    def fail_replace(*args):
+        raise AssertionError("unchanged data should not be rewritten")
+
+    monkeypatch.setattr("episode_owl.storage.os.replace", fail_replace)
+
+    save_shows(shows_data, shows_path)
+
+
+@pytest.mark.slow
+@pytest.mark.fsync
+def test_save_shows_fsyncs_file_and_directory(fast_tmp_path, monkeypatch):
+    """Test that the data and the rename are flushed to disk."""
+    synced = []
+    monkeypatch.setattr("episode_owl.storage.os.fsync", synced.append)
 
+    save_shows([{"id": 1, "name": "Test"}], fast_tmp_path / "shows.json")
 
-def test_load_shows_invalid_json(tmp_path):
+    expected = 1 if os.name == "nt" else 2
+    assert len(synced) == expected
+
+
+def test_load_shows_invalid_json(shows_path):
     """Test loading shows with invalid JSON."""
-    shows_path = tmp_path / "shows.json"
-    shows_path.write_text("{ invalid json }")
+    shows_path.write_bytes(b"{ invalid json }")
 
     with pytest.raises(StorageError):
         load_shows(shows_path)
 
 
-def test_add_show(tmp_path):
+def test_add_show(shows_path):
     """Test adding a show."""
-    shows_path = tmp_path / "shows.json"
-
     show = {"id": 123, "name": "Breaking Bad"}
 
     add_show(show, shows_path)
@@ -102,10 +202,8 @@ def test_add_show(tmp_path):
     assert shows[0]["id"] == 123
 
 
-def test_add_show_duplicate(tmp_path):
+def test_add_show_duplicate(shows_path):
     """Test adding duplicate show raises error."""
-    shows_path = tmp_path / "shows.json"
-
     show = {"id": 123, "name": "Breaking Bad"}
 
     add_show(show, shows_path)
@@ -114,16 +212,14 @@ def test_add_show_duplicate(tmp_path):
         add_show(show, shows_path)
 
 
-def test_remove_show(tmp_path):
+def test_remove_show(shows_path):
     """Test removing a show."""
-    shows_path = tmp_path / "shows.json"
-
     shows_data = [
         {"id": 1, "name": "Show 1"},
         {"id": 2, "name": "Show 2"},
     ]
 
-    save_shows(shows_data, shows_path)
+    _seed_shows(shows_path, shows_data)
 
     result = remove_show(1, shows_path)
 
@@ -134,27 +230,23 @@ def test_remove_show(tmp_path):
     assert shows[0]["id"] == 2
 
 
-def test_remove_show_nonexistent(tmp_path):
+def test_remove_show_nonexistent(shows_path):
     """Test removing nonexistent show."""
-    shows_path = tmp_path / "shows.json"
-
     shows_data = [{"id": 1, "name": "Show 1"}]
-    save_shows(shows_data, shows_path)
+    _seed_shows(shows_path, shows_data)
 
     result = remove_show(999, shows_path)
 
     assert result is False
 
 
-def test_update_show(tmp_path):
+def test_update_show(shows_path):
     """Test updating a show."""
-    shows_path = tmp_path / "shows.json"
-
     shows_data = [
         {"id": 1, "name": "Show 1", "last_seen_episode": 5},
     ]
 
-    save_shows(shows_data, shows_path)
+    _seed_shows(shows_path, shows_data)
 
     updates = {"last_seen_episode": 10, "last_seen_season": 2}
 
@@ -167,37 +259,67 @@ def test_update_show(tmp_path):
     assert shows[0]["last_seen_season"] == 2
 
 
-def test_update_show_nonexistent(tmp_path):
+def test_update_show_nonexistent(shows_path):
     """Test updating nonexistent show."""
-    shows_path = tmp_path / "shows.json"
-
     shows_data = [{"id": 1, "name": "Show 1"}]
-    save_shows(shows_data, shows_path)
+    _seed_shows(shows_path, shows_data)
 
     result = update_show(999, {"name": "New Name"}, shows_path)
 
     assert result is False
 
 
-def test_load_notifications_nonexistent(tmp_path):
-    """Test loading notifications when file doesn't exist."""
-    notif_path = tmp_path / "notifications.txt"
+def test_show_store_batches_changes(shows_path):
+    """Test that a store applies several changes with one write."""
+    _seed_shows(shows_path, [{"id": 1, "name": "Show 1"}, {"id": 2, "name": "Show 2"}])
+
+    with ShowStore(shows_path) as store:
+        store.add({"id": 3, "name": "Show 3"})
+        assert store.remove(1) is True
+        assert store.update(2, {"last_seen_episode": 4}) is True
+        store.put({"id": 3, "name": "Show 3 (renamed)"})
+
+        # Nothing is written until the block exits
+        assert [s["id"] for s in load_shows(shows_path)] == [1, 2]
+
+    shows = load_shows(shows_path)
+    assert [s["id"] for s in shows] == [2, 3]
+    assert shows[0]["last_seen_episode"] == 4
+    assert shows[1]["name"] == "Show 3 (renamed)"
+
+
+def test_show_store_rejects_duplicate(shows_path):
+    """Test that adding a tracked show raises."""
+    _seed_shows(shows_path, [{"id": 1, "name": "Show 1"}])
+
+    with ShowStore(shows_path) as store:
+        with pytest.raises(StorageError):
+            store.add({"id": 1, "name": "Show 1"})
+        assert store.dirty is False
+
+
+def test_show_store_skips_write_on_error(shows_path):
+    """Test that changes are discarded if the block raises."""
+    _seed_shows(shows_path, [{"id": 1, "name": "Show 1"}])
+
+    with pytest.raises(RuntimeError):
+        with ShowStore(shows_path) as store:
+            store.remove(1)
+            raise RuntimeError("boom")
 
+    assert len(load_shows(shows_path)) == 1
+
+
+def test_load_notifications_nonexistent(notif_path):
+    """Test loading notifications when file doesn't exist."""
     notifications = load_notifications(notif_path)
 
     assert notifications == []
 
 
-def test_load_notifications(tmp_path):
-    """Test loading notifications."""
-    notif_path = tmp_path / "notifications.txt"
-
-    notif_path.write_text(
-        "2025-11-05 | Show 1 | S01E01 | Pilot\n"
-        "2025-11-04 | Show 2 | S02E05 | Episode 5\n"
-        "\n"  # Empty line
-        "2025-11-03 | Show 3 | S01E10 | Finale\n"
-    )
+def test_load_notifications(notif_path):
+    """Test loading a file in the old newest-first order."""
+    notif_path.write_bytes(_DATED_LINES)
 
     notifications = load_notifications(notif_path)
 
@@ -206,17 +328,9 @@ def test_load_notifications(tmp_path):
     assert "Show 2" in notifications[1]
 
 
-def test_load_notifications_with_limit(tmp_path):
+def test_load_notifications_with_limit(notif_path):
     """Test loading notifications with limit."""
-    notif_path = tmp_path / "notifications.txt"
-
-    notif_path.write_text(
-        "Line 1\n"
-        "Line 2\n"
-        "Line 3\n"
-        "Line 4\n"
-        "Line 5\n"
-    )
+    notif_path.write_bytes(_FIVE_LINES)
 
     notifications = load_notifications(notif_path, limit=2)
 
@@ -225,58 +339,144 @@ def test_load_notifications_with_limit(tmp_path):
     assert notifications[1] == "Line 2"
 
 
-def test_append_notifications(tmp_path):
-    """Test appending notifications."""
-    notif_path = tmp_path / "notifications.txt"
+def test_load_notifications_limit_skips_blank_lines(notif_path):
+    """Test that blank lines don't count towards the limit."""
+    notif_path.write_bytes(_HEADER + b"\nLine 3\nLine 2\n  \nLine 1\n\n")
+
+    assert load_notifications(notif_path, limit=2) == ["Line 1", "Line 2"]
 
-    # Create existing file
-    notif_path.write_text("Old 1\nOld 2\n")
+
+def test_append_notifications(notif_path):
+    """Test appending notifications."""
+    notif_path.write_bytes(_OLD_LINES)
 
     new_notifications = ["New 1", "New 2"]
 
     append_notifications(new_notifications, notif_path)
 
-    notifications = load_notifications(notif_path)
-
-    # New should be at the top
-    assert len(notifications) == 4
-    assert notifications[0] == "New 1"
-    assert notifications[1] == "New 2"
-    assert notifications[2] == "Old 1"
-    assert notifications[3] == "Old 2"
+    # New entries go after the old ones, newest ("New 1") last
+    assert _raw_lines(notif_path) == ["Old 2", "Old 1", "New 2", "New 1"]
 
 
-def test_append_notifications_empty(tmp_path):
+def test_append_notifications_empty(notif_path):
     """Test appending empty list does nothing."""
-    notif_path = tmp_path / "notifications.txt"
-
     append_notifications([], notif_path)
 
     # File should not be created
     assert not notif_path.exists()
 
 
-def test_append_notifications_new_file(tmp_path):
+def test_append_notifications_new_file(notif_path):
     """Test appending to new file."""
-    notif_path = tmp_path / "notifications.txt"
-
     new_notifications = ["First", "Second"]
 
     append_notifications(new_notifications, notif_path)
 
-    notifications = load_notifications(notif_path)
+    assert _raw_lines(notif_path) == ["Second", "First"]
 
-    assert len(notifications) == 2
-    assert notifications[0] == "First"
 
+def test_append_notifications_appends_to_end(notif_path):
+    """Test that appending leaves existing bytes alone and adds to the end."""
+    notif_path.write_bytes(_HEADER + b"Old 2\nOld 1")  # No trailing newline
 
-def test_prune_notifications(tmp_path):
-    """Test pruning old notifications."""
-    notif_path = tmp_path / "notifications.txt"
+    append_notifications(["New 1", "New 2"], notif_path)
+
+    assert notif_path.read_bytes() == _HEADER + b"Old 2\nOld 1\nNew 2\nNew 1\n"
+    assert load_notifications(notif_path) == ["New 1", "New 2", "Old 1", "Old 2"]
+
+
+@pytest.mark.parametrize("old_file", [
+    b"2025-11-05 | Show 1 | S01E02 | Two\n"
+    b"2025-11-05 | Show 1 | S01E03 | Three\n"
+    b"2025-11-01 | Show 2 | S02E01 | Older\n",
+    # Every entry on the same date
+    b"2025-11-05 | Show 1 | S01E03 | Two\n"
+    b"2025-11-05 | Show 1 | S01E02 | Three\n"
+    b"2025-11-05 | Show 1 | S01E01 | Older\n",
+    # Written with a non-ISO date_format
+    b"06/11/2025 | Show 1 | S01E03 | Two\n"
+    b"05/11/2025 | Show 1 | S01E02 | Three\n"
+    b"01/11/2025 | Show 1 | S01E01 | Older\n",
+], ids=["iso", "same-date", "custom-date"])
+def test_append_notifications_migrates_newest_first_file(notif_path, atomic_writes, old_file):
+    """Test that a file in the old newest-first order is converted once, atomically."""
+    notif_path.write_bytes(old_file)
+
+    assert load_notifications(notif_path, limit=1)[0].endswith("Two")
+
+    append_notifications(["2025-11-06 | Show 3 | S01E01 | Newest"], notif_path)
+
+    expected = ["Newest", "Two", "Three", "Older"]
+    assert [line.split(" | ")[3] for line in load_notifications(notif_path)] == expected
+    assert [line.split(" | ")[3] for line in load_notifications(notif_path, limit=2)] == expected[:2]
+    assert _raw_lines(notif_path)[0].endswith("Older")
+    assert atomic_writes == [notif_path]
+
+    # Already converted: later appends don't rewrite the file
+    append_notifications(["2025-11-07 | Show 3 | S01E02 | Newer"], notif_path)
+    assert atomic_writes == [notif_path]
+    assert load_notifications(notif_path, limit=1)[0].endswith("Newer")
+
+
+def test_load_notifications_limit_large_file(notif_path):
+    """Test tail reads of a large file."""
+    lines = [f"2025-01-01 | Show | S01E{i:04d} | {'x' * 80}" for i in range(500)]
+    notif_path.write_bytes(_HEADER + ("\n".join(lines) + "\n").encode("utf-8"))
+
+    newest = load_notifications(notif_path, limit=150)
+
+    assert newest == list(reversed(lines))[:150]
+    assert load_notifications(notif_path, limit=1000) == list(reversed(lines))
+
+
+def test_load_notifications_limit_empty_and_unterminated(notif_path):
+    """Test tail reads of an empty file and one without a final newline."""
+    notif_path.write_bytes(b"")
+
+    assert load_notifications(notif_path, limit=5) == []
 
-    # Create file with 10 notifications
-    lines = [f"Notification {i}" for i in range(10)]
-    notif_path.write_text("\n".join(lines))
+    notif_path.write_bytes(_HEADER + b"2025-11-01 | A | S01E01 | One\r\n2025-11-02 | A | S01E02 | Two")
+
+    assert load_notifications(notif_path, limit=5) == [
+        "2025-11-02 | A | S01E02 | Two",
+        "2025-11-01 | A | S01E01 | One",
+    ]
+
+
+def test_load_notifications_cached(notif_path):
+    """Test that an unchanged file is not read again."""
+    append_notifications(["2025-11-01 | A | S01E01 | One"], notif_path)
+
+    first = load_notifications(notif_path)
+
+    with patch.object(Path, "read_bytes", side_effect=AssertionError("file re-read")):
+        second = load_notifications(notif_path)
+        assert load_notifications(notif_path, limit=1) == first
+
+    assert second == first
+    # Callers get their own copy of the cached list
+    second.clear()
+    assert load_notifications(notif_path) == first
+
+
+def test_load_notifications_cache_invalidated(notif_path):
+    """Test that appends and outside edits are picked up."""
+    append_notifications(["2025-11-01 | A | S01E01 | One"], notif_path)
+    load_notifications(notif_path)
+
+    append_notifications(["2025-11-02 | A | S01E02 | Two"], notif_path)
+    assert len(load_notifications(notif_path)) == 2
+
+    # Edited by another program: different size, so the cache misses
+    with open(notif_path, "a") as f:
+        f.write("2025-11-03 | A | S01E03 | Three\n")
+    assert load_notifications(notif_path)[0].endswith("Three")
+
+
+def test_prune_notifications(notif_path):
+    """Test pruning old notifications."""
+    # Create file with 10 notifications, newest ("Notification 0") last
+    notif_path.write_bytes(_HEADER + b"\n".join(b"Notification %d" % i for i in reversed(range(10))))
 
     removed = prune_notifications(notif_path, keep=5)
 
@@ -288,12 +488,64 @@ def test_prune_notifications(tmp_path):
     assert notifications[4] == "Notification 4"
 
 
-def test_prune_notifications_under_limit(tmp_path):
-    """Test pruning when under limit."""
-    notif_path = tmp_path / "notifications.txt"
+def test_prune_notifications_keeps_tail_bytes(notif_path):
+    """Test that pruning drops the oldest lines and leaves the rest untouched."""
+    notif_path.write_bytes(_HEADER + (
+        "2025-11-01 | Old | S01E01 | Gone\n\n"
+        "2025-11-02 | Café | S01E02 | Kept  \n"
+        "2025-11-03 | New | S01E03 | Kept\n"
+    ).encode("utf-8"))
 
-    lines = ["Line 1", "Line 2"]
-    notif_path.write_text("\n".join(lines))
+    assert prune_notifications(notif_path, keep=2) == 1
+    assert notif_path.read_bytes() == _HEADER + (
+        "2025-11-02 | Café | S01E02 | Kept  \n"
+        "2025-11-03 | New | S01E03 | Kept\n".encode("utf-8")
+    )
+
+    assert prune_notifications(notif_path, keep=0) == 2
+    assert load_notifications(notif_path) == []
+
+
+@pytest.mark.slow
+def test_prune_notifications_large_file_memory(notif_path):
+    """Test that pruning a large file only holds the kept lines in memory."""
+    import tracemalloc
+
+    lines = [f"2025-01-01 | Show | E{i:05d} | {'x' * 60}" for i in range(20_000)]
+    notif_path.write_bytes(_HEADER + ("\n".join(lines) + "\n").encode("utf-8"))
+
+    tracemalloc.start()
+    try:
+        removed = prune_notifications(notif_path, keep=100)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert removed == 19_900
+    assert load_notifications(notif_path) == list(reversed(lines[-100:]))
+    # The file is ~1.7 MB; only ~100 lines should ever be resident
+    assert peak < 256 * 1024
+
+
+def test_prune_notifications_old_order(notif_path, atomic_writes):
+    """Test pruning a file in the old newest-first order, replacing it atomically."""
+    notif_path.write_bytes(
+        b"2025-11-03 | A | S01E03 | Three\n"
+        b"2025-11-02 | A | S01E02 | Two\n"
+        b"2025-11-01 | A | S01E01 | One\n"
+    )
+
+    assert prune_notifications(notif_path, keep=2) == 1
+    assert _raw_lines(notif_path) == [
+        "2025-11-02 | A | S01E02 | Two",
+        "2025-11-03 | A | S01E03 | Three",
+    ]
+    assert atomic_writes == [notif_path]
+
+
+def test_prune_notifications_under_limit(notif_path):
+    """Test pruning when under limit."""
+    notif_path.write_bytes(_HEADER + b"Line 1\nLine 2")
 
     removed = prune_notifications(notif_path, keep=10)
 
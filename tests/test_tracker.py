@@ -13,10 +13,20 @@ from episode_owl.tracker import (
     find_new_episodes,
     should_include_episode,
     filter_aired_episodes,
+    iter_new_episodes,
+    find_latest_aired_episode,
     create_show_dict,
     update_show_state,
+    record_next_airdate,
+    find_next_airdate,
+    should_skip_check,
+    mark_no_new_episodes,
 )
 
+# Computed once so every test in a run agrees on the dates
+_YESTERDAY = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+_TOMORROW = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+
 
 def test_episode_creation():
     """Test Episode namedtuple creation."""
@@ -34,6 +44,16 @@ def test_episode_creation():
     assert episode.airdate == "2025-11-05"
 
 
+def test_episode_is_lightweight():
+    """Test that Episode is an immutable tuple without a per-instance dict."""
+    episode = Episode(season=1, number=1, title="Pilot", airdate="2025-11-01")
+
+    assert Episode.__slots__ == ()
+    assert not hasattr(episode, "__dict__")
+    with pytest.raises(AttributeError):
+        episode.title = "Other"
+
+
 def test_parse_episode_from_api():
     """Test parsing episode from API response."""
     api_data = {
@@ -64,6 +84,15 @@ def test_parse_episode_missing_title():
     assert episode.title == "Episode 3"
 
 
+def test_parse_episode_null_title():
+    """Test parsing episode whose title is null in the API response."""
+    api_data = {"season": 1, "number": 3, "name": None, "airdate": "2025-11-01"}
+
+    episode = parse_episode_from_api(api_data)
+
+    assert episode.title == "Episode 3"
+
+
 def test_parse_episode_no_season():
     """Test parsing episode without season (absolute numbering)."""
     api_data = {
@@ -78,36 +107,17 @@ def test_parse_episode_no_season():
     assert episode.number == 42
 
 
-def test_compare_episodes_newer_season():
-    """Test comparing episodes - newer season."""
-    last_seen = (1, 10)
-    episode = Episode(season=2, number=1, title="Test", airdate="2025-11-01")
-
-    assert compare_episodes(last_seen, episode) is True
-
-
-def test_compare_episodes_same_season_newer():
-    """Test comparing episodes - same season, newer episode."""
-    last_seen = (1, 5)
-    episode = Episode(season=1, number=10, title="Test", airdate="2025-11-01")
+@pytest.mark.parametrize("last_seen,season,number,expected", [
+    ((1, 10), 2, 1, True),  # Newer season
+    ((1, 5), 1, 10, True),  # Same season, newer episode
+    ((1, 5), 1, 5, False),  # Same episode
+    ((2, 10), 1, 5, False),  # Older episode
+])
+def test_compare_episodes(last_seen, season, number, expected):
+    """Test comparing episodes against the last seen one."""
+    episode = Episode(season=season, number=number, title="Test", airdate="2025-11-01")
 
-    assert compare_episodes(last_seen, episode) is True
-
-
-def test_compare_episodes_same_episode():
-    """Test comparing episodes - same episode."""
-    last_seen = (1, 5)
-    episode = Episode(season=1, number=5, title="Test", airdate="2025-11-01")
-
-    assert compare_episodes(last_seen, episode) is False
-
-
-def test_compare_episodes_older():
-    """Test comparing episodes - older episode."""
-    last_seen = (2, 10)
-    episode = Episode(season=1, number=5, title="Test", airdate="2025-11-01")
-
-    assert compare_episodes(last_seen, episode) is False
+    assert compare_episodes(last_seen, episode) is expected
 
 
 def test_compare_episodes_absolute_numbering():
@@ -154,6 +164,16 @@ def test_get_latest_episode_across_seasons():
     assert latest.number == 5
 
 
+def test_get_latest_episode_ties_keep_last():
+    """Test that the last of equally ranked episodes is returned."""
+    episodes = [
+        Episode(season=None, number=3, title="First", airdate="2025-11-01"),
+        Episode(season=0, number=3, title="Second", airdate="2025-11-02"),
+    ]
+
+    assert get_latest_episode(episodes).title == "Second"
+
+
 def test_find_new_episodes():
     """Test finding new episodes."""
     episodes = [
@@ -184,33 +204,50 @@ def test_find_new_episodes_none():
     assert len(new) == 0
 
 
-def test_should_include_episode_aired():
-    """Test should_include_episode for aired episode."""
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-    episode = Episode(season=1, number=1, title="Test", airdate=yesterday)
+@pytest.mark.parametrize("last_seen", [(1, 2), (2, 0), (None, 3), (None, 12)])
+def test_find_new_episodes_matches_compare_episodes(last_seen):
+    """Test that find_new_episodes applies the same rules as compare_episodes."""
+    episodes = [
+        Episode(season=2, number=1, title="S2E1", airdate="2025-11-05"),
+        Episode(season=1, number=3, title="S1E3", airdate="2025-11-03", absolute_number=3),
+        Episode(season=None, number=4, title="Abs4", airdate="2025-11-04"),
+        Episode(season=None, number=1, title="Abs13", airdate="2025-11-06", absolute_number=13),
+        Episode(season=1, number=1, title="S1E1", airdate="2025-11-01"),
+    ]
 
-    assert should_include_episode(episode) is True
+    expected = sorted(
+        (ep for ep in episodes if compare_episodes(last_seen, ep)),
+        key=lambda e: ((e.season or 0), e.number)
+    )
 
+    assert find_new_episodes(episodes, last_seen) == expected
 
-def test_should_include_episode_not_aired():
-    """Test should_include_episode for future episode."""
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-    episode = Episode(season=1, number=1, title="Test", airdate=tomorrow)
 
-    assert should_include_episode(episode) is False
+@pytest.mark.parametrize("airdate,expected", [
+    (_YESTERDAY, True),
+    (_TOMORROW, False),
+    ("", False),  # No airdate
+])
+def test_should_include_episode_airdate(airdate, expected):
+    """Test should_include_episode for aired, future and undated episodes."""
+    episode = Episode(season=1, number=1, title="Test", airdate=airdate)
 
+    assert should_include_episode(episode) is expected
 
-def test_should_include_episode_no_airdate():
-    """Test should_include_episode for episode without airdate."""
-    episode = Episode(season=1, number=1, title="Test", airdate="")
 
-    assert should_include_episode(episode) is False
+def test_should_include_episode_explicit_today():
+    """Test should_include_episode against a given date and malformed airdates."""
+    episode = Episode(season=1, number=1, title="Test", airdate="2025-11-15")
+
+    assert should_include_episode(episode, today="2025-11-15") is True
+    assert should_include_episode(episode, today="2025-11-14") is False
+    assert should_include_episode(episode._replace(airdate="15/11/2025"), today="2025-12-01") is False
+    assert should_include_episode(episode._replace(airdate="2025"), today="2025-12-01") is False
 
 
 def test_should_include_episode_special():
     """Test should_include_episode for special episode."""
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-    episode = Episode(season=0, number=1, title="Special", airdate=yesterday)
+    episode = Episode(season=0, number=1, title="Special", airdate=_YESTERDAY)
 
     assert should_include_episode(episode, include_specials="none") is False
     assert should_include_episode(episode, include_specials="all") is True
@@ -219,31 +256,26 @@ def test_should_include_episode_special():
 
 def test_should_include_episode_smart_mode_movie():
     """Test smart mode includes movies (significant_special)."""
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-
     # Movie/significant special
-    movie = Episode(season=0, number=1, title="Movie", airdate=yesterday, episode_type="significant_special")
+    movie = Episode(season=0, number=1, title="Movie", airdate=_YESTERDAY, episode_type="significant_special")
     assert should_include_episode(movie, include_specials="smart") is True
 
     # OVA/insignificant special
-    ova = Episode(season=0, number=2, title="OVA", airdate=yesterday, episode_type="insignificant_special")
+    ova = Episode(season=0, number=2, title="OVA", airdate=_YESTERDAY, episode_type="insignificant_special")
     assert should_include_episode(ova, include_specials="smart") is False
 
     # Regular episode
-    regular = Episode(season=1, number=1, title="Regular", airdate=yesterday, episode_type="regular")
+    regular = Episode(season=1, number=1, title="Regular", airdate=_YESTERDAY, episode_type="regular")
     assert should_include_episode(regular, include_specials="smart") is True
 
 
 def test_filter_aired_episodes():
     """Test filtering aired episodes."""
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-
     episodes = [
-        Episode(season=1, number=1, title="E1", airdate=yesterday),
-        Episode(season=1, number=2, title="E2", airdate=tomorrow),
+        Episode(season=1, number=1, title="E1", airdate=_YESTERDAY),
+        Episode(season=1, number=2, title="E2", airdate=_TOMORROW),
         Episode(season=1, number=3, title="E3", airdate=""),
-        Episode(season=0, number=1, title="Special", airdate=yesterday),
+        Episode(season=0, number=1, title="Special", airdate=_YESTERDAY),
     ]
 
     # Test with "none" mode - exclude specials
@@ -256,6 +288,92 @@ def test_filter_aired_episodes():
     assert len(filtered_all) == 2  # Regular episode + special
 
 
+def test_iter_new_episodes():
+    """Test iterating new aired episodes newest first."""
+    episodes_data = [
+        {"season": 1, "number": 1, "name": "E1", "airdate": "2025-01-01"},
+        {"season": 1, "number": 2, "name": "E2", "airdate": "2025-01-08"},
+        {"season": 2, "number": 1, "name": "E3", "airdate": _YESTERDAY},
+        {"season": 2, "number": 2, "name": "E4", "airdate": _TOMORROW},
+    ]
+
+    new = list(iter_new_episodes(episodes_data, (1, 1)))
+
+    assert [ep.title for ep in new] == ["E3", "E2"]
+
+
+def test_iter_new_episodes_matches_full_pipeline():
+    """Test the short-circuit scan agrees with parse + filter + find."""
+    episodes_data = [
+        {"season": 0, "number": 1, "name": "Special", "airdate": "2025-01-01"},
+        {"season": 1, "number": 1, "name": "E1", "airdate": "2025-01-01"},
+        {"season": 1, "number": 2, "name": "E2", "airdate": ""},
+        {"season": 1, "number": 3, "name": "E3", "airdate": _YESTERDAY},
+    ]
+
+    for last_seen in [(None, 0), (1, 1), (1, 3)]:
+        episodes = [parse_episode_from_api(ep) for ep in episodes_data]
+        expected = find_new_episodes(filter_aired_episodes(episodes, "all"), last_seen)
+
+        new = list(iter_new_episodes(episodes_data, last_seen, include_specials="all"))
+        new.reverse()
+
+        assert new == expected
+
+
+@pytest.mark.parametrize("episodes_data,last_seen", [
+    # Absolute numbering: S1E10 is new even though S2E3 sorts after it
+    ([
+        {"season": 1, "number": 10, "name": "S1E10", "airdate": "2025-01-01"},
+        {"season": 2, "number": 3, "name": "S2E3", "airdate": "2025-01-08"},
+    ], (None, 5)),
+    # Episodes without a season sort first but compare by number
+    ([
+        {"season": None, "number": 7, "name": "E7", "airdate": "2025-01-01"},
+        {"season": 1, "number": 1, "name": "S1E1", "airdate": "2025-01-08"},
+    ], (1, 5)),
+], ids=["no-last-season", "no-episode-season"])
+def test_iter_new_episodes_absolute_numbering(episodes_data, last_seen):
+    """Test that absolute-number comparisons don't stop the scan early."""
+    episodes = [parse_episode_from_api(ep) for ep in episodes_data]
+    expected = find_new_episodes(filter_aired_episodes(episodes, "all"), last_seen)
+
+    new = list(iter_new_episodes(episodes_data, last_seen, include_specials="all"))
+    new.reverse()
+
+    assert new == expected
+    assert len(new) == 1
+
+
+def test_iter_new_episodes_up_to_date():
+    """Test an up-to-date show stops after the first comparison."""
+    episodes_data = [
+        {"season": 1, "number": n, "name": f"E{n}", "airdate": "2025-01-01"}
+        for n in range(1, 501)
+    ]
+
+    assert list(iter_new_episodes(episodes_data, (1, 500))) == []
+
+
+def test_find_latest_aired_episode_matches_full_pipeline():
+    """Test the latest-episode scan agrees with parse + filter + get_latest."""
+    episodes_data = [
+        {"season": 1, "number": 1, "name": "E1", "airdate": "2025-01-01"},
+        {"season": 0, "number": 1, "name": "Special", "airdate": "2025-01-05"},
+        {"season": 1, "number": 2, "name": "E2", "airdate": "2025-01-08"},
+        {"season": 1, "number": 3, "name": "E3", "airdate": _TOMORROW},
+    ]
+
+    for include_specials in ["smart", "all", "none"]:
+        episodes = [parse_episode_from_api(ep) for ep in episodes_data]
+        expected = get_latest_episode(filter_aired_episodes(episodes, include_specials))
+
+        assert find_latest_aired_episode(episodes_data, include_specials) == expected
+
+    assert find_latest_aired_episode(episodes_data).title == "E2"
+    assert find_latest_aired_episode([]) is None
+
+
 def test_create_show_dict():
     """Test creating show dictionary for storage."""
     show = create_show_dict(123, "Test Show")
@@ -279,6 +397,14 @@ def test_create_show_dict_with_episode():
     assert show["last_seen_episode"] == 5
 
 
+def test_create_show_dict_with_status():
+    """Test that the TVMaze status is stored with the show."""
+    show = create_show_dict(123, "Test Show", status="Ended")
+
+    assert show["status"] == "Ended"
+    assert create_show_dict(123, "Test Show")["status"] is None
+
+
 def test_update_show_state():
     """Test updating show state."""
     show = {
@@ -301,3 +427,92 @@ def test_update_show_state():
     assert updated["last_seen_episode"] == 10
     assert updated["last_seen_season"] == 1
     assert updated["last_checked"] != "2025-11-01T10:00:00"
+
+
+def test_update_show_state_uses_given_time():
+    """Test that a shared timestamp is used for last_checked."""
+    show = {"id": 123, "name": "Test Show"}
+    episode = Episode(season=1, number=10, title="Test", airdate="2025-11-05")
+
+    updated = update_show_state(show, episode, now="2025-11-06T08:00:00")
+    created = create_show_dict(1, "New Show", now="2025-11-06T08:00:00")
+
+    assert updated["last_checked"] == "2025-11-06T08:00:00"
+    assert created["last_checked"] == "2025-11-06T08:00:00"
+
+
+def test_update_show_state_records_next_airdate():
+    """Test that updating state records the next airdate and clears force_check."""
+    show = {"id": 123, "name": "Test Show", "force_check": True}
+    episode = Episode(season=1, number=10, title="Test", airdate="2025-11-05")
+
+    updated = update_show_state(show, episode, "2025-11-12")
+
+    assert updated["next_airdate"] == "2025-11-12"
+    assert "force_check" not in updated
+    assert show["force_check"] is True
+
+
+def test_record_next_airdate():
+    """Test recording next airdate without touching last_seen state."""
+    show = {"id": 123, "last_seen_season": 1, "last_seen_episode": 5, "force_check": True}
+
+    updated = record_next_airdate(show, None)
+
+    assert updated["next_airdate"] is None
+    assert updated["last_seen_episode"] == 5
+    assert "force_check" not in updated
+
+
+def test_find_next_airdate():
+    """Test finding the earliest unaired episode's airdate."""
+    episodes_data = [
+        {"season": 1, "number": 1, "airdate": "2025-11-01"},
+        {"season": 1, "number": 2, "airdate": "2025-11-08"},
+        {"season": 1, "number": 3, "airdate": "2025-11-15"},
+        {"season": 1, "number": 4, "airdate": "2025-11-22"},
+        {"season": 1, "number": 5, "airdate": ""},
+    ]
+
+    assert find_next_airdate(episodes_data, today="2025-11-10") == "2025-11-15"
+    # An episode airing today is not "next"
+    assert find_next_airdate(episodes_data, today="2025-11-15") == "2025-11-22"
+    assert find_next_airdate(episodes_data, today="2025-12-01") is None
+    assert find_next_airdate([], today="2025-11-10") is None
+
+
+def test_should_skip_check():
+    """Test skipping shows whose next episode hasn't aired yet."""
+    show = {"id": 1, "next_airdate": "2025-11-15"}
+
+    assert should_skip_check(show, today="2025-11-10") is True
+    assert should_skip_check(show, today="2025-11-15") is False
+    assert should_skip_check({**show, "force_check": True}, today="2025-11-10") is False
+    assert should_skip_check({"id": 1, "next_airdate": None}, today="2025-11-10") is False
+    assert should_skip_check({"id": 1}, today="2025-11-10") is False
+
+
+def test_should_skip_check_ended_show():
+    """Test that ended shows with nothing new are skipped until recheck is due."""
+    show = {"id": 1, "status": "Ended", "no_new_since": "2025-11-01"}
+
+    assert should_skip_check(show, today="2025-11-20", ended_recheck_days=30) is True
+    assert should_skip_check(show, today="2025-12-01", ended_recheck_days=30) is False
+    assert should_skip_check(show, today="2025-11-20", ended_recheck_days=0) is False
+    assert should_skip_check({**show, "status": "Running"}, today="2025-11-20",
+                             ended_recheck_days=30) is False
+    assert should_skip_check({**show, "force_check": True}, today="2025-11-20",
+                             ended_recheck_days=30) is False
+
+
+def test_mark_no_new_episodes():
+    """Test stamping a check that found nothing new, and clearing it on update."""
+    show = {"id": 1, "status": "Ended"}
+
+    marked = mark_no_new_episodes(show, today="2025-11-01")
+
+    assert marked["no_new_since"] == "2025-11-01"
+    assert "no_new_since" not in show
+
+    episode = Episode(season=1, number=2, title="Test", airdate="2025-11-05")
+    assert "no_new_since" not in update_show_state(marked, episode)
@@ -1,135 +1,164 @@
 """Tests for utils module."""
 
-import os
-from pathlib import Path
-from unittest.mock import Mock, patch, call
-
 import pytest
 
 from episode_owl.utils import (
+    _CI_INDICATORS,
     open_timeline_file,
     is_running_in_ci,
     should_auto_open,
 )
 
 
-def test_open_timeline_file_windows(tmp_path):
+def _raise(exc):
+    """Build a stub that raises exc when called."""
+    def stub(*args, **kwargs):
+        raise exc
+    return stub
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Record the commands passed to os.startfile and subprocess.Popen."""
+    calls = []
+    monkeypatch.setattr("episode_owl.utils.os.startfile", lambda path: calls.append(path), raising=False)
+    monkeypatch.setattr("episode_owl.utils.subprocess.Popen", calls.append)
+    return calls
+
+
+def test_open_timeline_file_windows(tmp_path, monkeypatch, opened):
     """Test opening file on Windows."""
     timeline_file = tmp_path / "notifications.txt"
     timeline_file.write_text("test")
+    monkeypatch.setattr("episode_owl.utils.sys.platform", "win32")
 
-    with patch('episode_owl.utils.sys.platform', 'win32'):
-        with patch('episode_owl.utils.os.startfile', create=True) as mock_startfile:
-            result = open_timeline_file(timeline_file)
+    result = open_timeline_file(timeline_file)
 
-            assert result is True
-            mock_startfile.assert_called_once_with(str(timeline_file))
+    assert result is True
+    assert opened == [str(timeline_file)]
 
 
-@patch('episode_owl.utils.sys.platform', 'darwin')
-@patch('episode_owl.utils.subprocess.Popen')
-def test_open_timeline_file_macos(mock_popen, tmp_path):
+def test_open_timeline_file_macos(tmp_path, monkeypatch, opened):
     """Test opening file on macOS."""
     timeline_file = tmp_path / "notifications.txt"
     timeline_file.write_text("test")
+    monkeypatch.setattr("episode_owl.utils.sys.platform", "darwin")
 
     result = open_timeline_file(timeline_file)
 
     assert result is True
-    mock_popen.assert_called_once_with(["open", str(timeline_file)])
+    assert opened == [["open", str(timeline_file)]]
 
 
-@patch('episode_owl.utils.sys.platform', 'linux')
-@patch('episode_owl.utils.subprocess.Popen')
-def test_open_timeline_file_linux(mock_popen, tmp_path):
+def test_open_timeline_file_linux(tmp_path, monkeypatch, opened):
     """Test opening file on Linux."""
     timeline_file = tmp_path / "notifications.txt"
     timeline_file.write_text("test")
+    monkeypatch.setattr("episode_owl.utils.sys.platform", "linux")
 
     result = open_timeline_file(timeline_file)
 
     assert result is True
-    mock_popen.assert_called_once_with(["xdg-open", str(timeline_file)])
+    assert opened == [["xdg-open", str(timeline_file)]]
 
 
-def test_open_timeline_file_creates_if_not_exists(tmp_path):
+def test_open_timeline_file_creates_if_not_exists(tmp_path, monkeypatch, opened):
     """Test creating file if it doesn't exist."""
     timeline_file = tmp_path / "notifications.txt"
+    monkeypatch.setattr("episode_owl.utils.sys.platform", "win32")
 
-    with patch('episode_owl.utils.sys.platform', 'win32'):
-        with patch('episode_owl.utils.os.startfile', create=True) as mock_startfile:
-            result = open_timeline_file(timeline_file)
+    result = open_timeline_file(timeline_file)
 
-            assert result is True
-            assert timeline_file.exists()
-            mock_startfile.assert_called_once()
+    assert result is True
+    assert timeline_file.exists()
+    assert len(opened) == 1
 
 
-def test_open_timeline_file_windows_fallback_to_notepad(tmp_path):
+def test_open_timeline_file_windows_fallback_to_notepad(tmp_path, monkeypatch, opened):
     """Test fallback to notepad when os.startfile fails."""
     timeline_file = tmp_path / "notifications.txt"
     timeline_file.write_text("test")
+    monkeypatch.setattr("episode_owl.utils.sys.platform", "win32")
+    monkeypatch.setattr("episode_owl.utils.os.startfile", _raise(OSError("Error")), raising=False)
 
-    with patch('episode_owl.utils.sys.platform', 'win32'):
-        with patch('episode_owl.utils.os.startfile', create=True, side_effect=OSError("Error")):
-            with patch('episode_owl.utils.subprocess.Popen') as mock_popen:
-                result = open_timeline_file(timeline_file)
+    result = open_timeline_file(timeline_file)
 
-                assert result is True
-                mock_popen.assert_called_once_with(["notepad.exe", str(timeline_file)])
+    assert result is True
+    assert opened == [["notepad.exe", str(timeline_file)]]
 
 
-def test_open_timeline_file_handles_errors_gracefully(tmp_path):
+def test_open_timeline_file_handles_errors_gracefully(tmp_path, monkeypatch):
     """Test that errors are handled gracefully."""
     timeline_file = tmp_path / "notifications.txt"
     timeline_file.write_text("test")
+    monkeypatch.setattr("episode_owl.utils.sys.platform", "win32")
+    monkeypatch.setattr("episode_owl.utils.os.startfile", _raise(Exception("Error")), raising=False)
+    monkeypatch.setattr("episode_owl.utils.subprocess.Popen", _raise(Exception("Error")))
+
+    result = open_timeline_file(timeline_file)
 
-    with patch('episode_owl.utils.sys.platform', 'win32'):
-        with patch('episode_owl.utils.os.startfile', create=True, side_effect=Exception("Error")):
-            with patch('episode_owl.utils.subprocess.Popen', side_effect=Exception("Error")):
-                result = open_timeline_file(timeline_file)
+    # Should return False but not crash
+    assert result is False
 
-                # Should return False but not crash
-                assert result is False
 
+@pytest.fixture(autouse=True)
+def clear_ci_cache():
+    """Re-detect CI for every test, since tests patch the environment."""
+    is_running_in_ci.cache_clear()
+    yield
+    is_running_in_ci.cache_clear()
 
-def test_is_running_in_ci_true():
+
+def test_is_running_in_ci_true(monkeypatch):
     """Test CI detection when running in CI."""
-    with patch.dict(os.environ, {"CI": "true"}):
-        assert is_running_in_ci() is True
+    monkeypatch.setenv("CI", "true")
+
+    assert is_running_in_ci() is True
 
 
-def test_is_running_in_ci_github_actions():
+def test_is_running_in_ci_github_actions(monkeypatch):
     """Test CI detection for GitHub Actions."""
-    with patch.dict(os.environ, {"GITHUB_ACTIONS": "true"}):
-        assert is_running_in_ci() is True
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
 
+    assert is_running_in_ci() is True
 
-def test_is_running_in_ci_false():
+
+@pytest.fixture
+def no_ci_env(monkeypatch):
+    """Remove every CI indicator from the environment."""
+    for name in _CI_INDICATORS:
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_is_running_in_ci_false(no_ci_env):
     """Test CI detection when not in CI."""
-    with patch.dict(os.environ, {}, clear=True):
-        assert is_running_in_ci() is False
+    assert is_running_in_ci() is False
+
 
+def test_is_running_in_ci_ignores_empty_values(no_ci_env, monkeypatch):
+    """Test that CI variables set to an empty string don't count."""
+    monkeypatch.setenv("CI", "")
 
-def test_should_auto_open_config_enabled():
-    """Test auto-open when config is enabled."""
-    with patch('episode_owl.utils.is_running_in_ci', return_value=False):
-        assert should_auto_open(True, False) is True
+    assert is_running_in_ci() is False
 
 
-def test_should_auto_open_config_disabled():
-    """Test auto-open when config is disabled."""
-    with patch('episode_owl.utils.is_running_in_ci', return_value=False):
-        assert should_auto_open(False, False) is False
+def test_is_running_in_ci_cached(monkeypatch):
+    """Test that the environment is only inspected once."""
+    monkeypatch.setenv("CI", "true")
+    assert is_running_in_ci() is True
 
+    monkeypatch.delenv("CI")
+    assert is_running_in_ci() is True
 
-def test_should_auto_open_cli_override():
-    """Test auto-open with CLI override."""
-    with patch('episode_owl.utils.is_running_in_ci', return_value=False):
-        assert should_auto_open(True, True) is False
 
+@pytest.mark.parametrize("config_enabled,cli_override,in_ci,expected", [
+    (True, False, False, True),  # Config enabled
+    (False, False, False, False),  # Config disabled
+    (True, True, False, False),  # CLI override
+    (True, False, True, False),  # Disabled in CI
+])
+def test_should_auto_open(monkeypatch, config_enabled, cli_override, in_ci, expected):
+    """Test auto-open decisions from config, CLI flag and CI detection."""
+    monkeypatch.setattr("episode_owl.utils.is_running_in_ci", lambda: in_ci)
 
-def test_should_auto_open_in_ci():
-    """Test auto-open is disabled in CI."""
-    with patch('episode_owl.utils.is_running_in_ci', return_value=True):
-        assert should_auto_open(True, False) is False
+    assert should_auto_open(config_enabled, cli_override) is expected
@@ -1,9 +1,12 @@
 """Tests for watched module."""
 
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 
+from episode_owl import jsonio
+from episode_owl.storage import StorageError
 from episode_owl.watched import (
     NotificationKey,
     WatchedState,
@@ -11,6 +14,33 @@ from episode_owl.watched import (
     parse_notification_indices,
 )
 
+# Key stored in the seeded_state fixture's file
+SEEDED_KEY = NotificationKey("2025-11-05", "Show 1", "S01E01")
+
+
+@pytest.fixture
+def empty_state(fast_tmp_path):
+    """Watched state backed by a file that doesn't exist yet."""
+    return WatchedState(fast_tmp_path / "watched.json")
+
+
+@pytest.fixture
+def in_memory_state(empty_state, monkeypatch):
+    """Empty watched state that never writes its file.
+
+    For tests of the in-memory bookkeeping; the save path has its own tests.
+    """
+    monkeypatch.setattr(empty_state, "_save", lambda: None)
+    return empty_state
+
+
+@pytest.fixture
+def seeded_state(fast_tmp_path):
+    """Watched state loaded from a file already containing SEEDED_KEY."""
+    watched_file = fast_tmp_path / "watched.json"
+    watched_file.write_bytes(jsonio.dumps({"watched": [SEEDED_KEY.to_string()]}))
+    return WatchedState(watched_file)
+
 
 def test_notification_key_to_string():
     """Test converting notification key to string."""
@@ -47,15 +77,30 @@ def test_notification_key_from_notification_line():
     assert key.episode_code == "S05E16"
 
 
+def test_notification_key_from_notification_line_pipe_in_title():
+    """Test that pipes in the episode title don't affect the key."""
+    line = "2025-11-05 | Breaking Bad | S05E16 | Felina | Part 2"
+
+    key = NotificationKey.from_notification_line(line)
+
+    assert key == NotificationKey("2025-11-05", "Breaking Bad", "S05E16")
+
+
+def test_notification_key_from_string_too_many_fields():
+    """Test that keys with extra fields are rejected."""
+    with pytest.raises(ValueError):
+        NotificationKey.from_string("2025-11-05|Breaking Bad|S05E16|extra")
+
+
 def test_notification_key_from_notification_line_invalid():
     """Test parsing invalid notification line raises error."""
     with pytest.raises(ValueError):
         NotificationKey.from_notification_line("invalid line")
 
 
-def test_watched_state_initialization(tmp_path):
+def test_watched_state_initialization(fast_tmp_path):
     """Test creating watched state."""
-    watched_file = tmp_path / "watched.json"
+    watched_file = fast_tmp_path / "watched.json"
 
     state = WatchedState(watched_file)
 
@@ -63,10 +108,9 @@ def test_watched_state_initialization(tmp_path):
     assert len(state.watched_keys) == 0
 
 
-def test_watched_state_mark_watched(tmp_path):
+def test_watched_state_mark_watched(in_memory_state):
     """Test marking notifications as watched."""
-    watched_file = tmp_path / "watched.json"
-    state = WatchedState(watched_file)
+    state = in_memory_state
 
     keys = [
         NotificationKey("2025-11-05", "Show 1", "S01E01"),
@@ -78,11 +122,12 @@ def test_watched_state_mark_watched(tmp_path):
     assert count == 2
     assert state.is_watched(keys[0])
     assert state.is_watched(keys[1])
+    assert not state.file_path.exists()
 
 
-def test_watched_state_persistence(tmp_path):
+def test_watched_state_persistence(fast_tmp_path):
     """Test watched state is persisted to file."""
-    watched_file = tmp_path / "watched.json"
+    watched_file = fast_tmp_path / "watched.json"
 
     # Create and mark some as watched
     state1 = WatchedState(watched_file)
@@ -95,24 +140,63 @@ def test_watched_state_persistence(tmp_path):
     assert state2.is_watched(keys[0])
 
 
-def test_watched_state_is_watched(tmp_path):
-    """Test checking if notification is watched."""
-    watched_file = tmp_path / "watched.json"
+def test_watched_state_mark_already_watched_skips_save(fast_tmp_path):
+    """Test that re-marking watched notifications doesn't rewrite the file."""
+    watched_file = fast_tmp_path / "watched.json"
     state = WatchedState(watched_file)
 
-    key1 = NotificationKey("2025-11-05", "Show 1", "S01E01")
-    key2 = NotificationKey("2025-11-05", "Show 2", "S01E02")
+    key = NotificationKey("2025-11-05", "Show", "S01E01")
+    state.mark_watched([key])
+    watched_file.unlink()
+
+    assert state.mark_watched([key]) == 0
+    assert not watched_file.exists()
+
+
+def test_watched_state_save_is_atomic(fast_tmp_path):
+    """Test that saving leaves only the finished watched file behind."""
+    watched_file = fast_tmp_path / "watched.json"
+    state = WatchedState(watched_file)
+
+    state.mark_watched([NotificationKey("2025-11-05", "Show", "S01E01")])
+
+    assert [p.name for p in fast_tmp_path.iterdir()] == ["watched.json"]
+    assert WatchedState(watched_file).get_watched_count() == 1
+
+
+def test_watched_state_non_ascii_round_trip(fast_tmp_path):
+    """Test that non-ASCII show names survive a save and load."""
+    watched_file = fast_tmp_path / "watched.json"
+    key = NotificationKey("2025-11-05", "Café Ōkami", "S01E01")
+
+    WatchedState(watched_file).mark_watched([key])
+
+    assert WatchedState(watched_file).is_watched(key)
+
+
+def test_watched_state_corrupt_file_raises(fast_tmp_path):
+    """Test that a corrupt watched file is reported instead of reset."""
+    watched_file = fast_tmp_path / "watched.json"
+    watched_file.write_text("{ invalid json }")
+
+    with pytest.raises(StorageError):
+        WatchedState(watched_file)
 
-    state.mark_watched([key1])
+
+def test_watched_state_is_watched(seeded_state):
+    """Test checking if notification is watched."""
+    state = seeded_state
+
+    key1 = SEEDED_KEY
+    key2 = NotificationKey("2025-11-05", "Show 2", "S01E02")
 
     assert state.is_watched(key1) is True
     assert state.is_watched(key2) is False
 
 
-def test_watched_state_get_watched_count(tmp_path):
+def test_watched_state_get_watched_count(in_memory_state):
     """Test getting count of watched notifications."""
-    watched_file = tmp_path / "watched.json"
-    state = WatchedState(watched_file)
+    state = in_memory_state
 
     assert state.get_watched_count() == 0
 
@@ -125,14 +209,16 @@ def test_watched_state_get_watched_count(tmp_path):
     assert state.get_watched_count() == 2
 
 
-def test_watched_state_archive_old_watched(tmp_path):
+def test_watched_state_archive_old_watched(in_memory_state):
     """Test archiving old watched notifications."""
-    watched_file = tmp_path / "watched.json"
-    state = WatchedState(watched_file)
+    state = in_memory_state
+
+    old_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    recent_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
     keys = [
-        NotificationKey("2025-10-01", "Old Show", "S01E01"),  # Old
-        NotificationKey("2025-11-05", "New Show", "S01E01"),  # Recent
+        NotificationKey(old_date, "Old Show", "S01E01"),  # Old
+        NotificationKey(recent_date, "New Show", "S01E01"),  # Recent
     ]
     state.mark_watched(keys)
 
@@ -144,121 +230,95 @@ def test_watched_state_archive_old_watched(tmp_path):
     assert state.is_watched(keys[1])  # Recent one still there
 
 
-def test_watched_state_archive_zero_days(tmp_path):
-    """Test archive with zero days does nothing."""
-    watched_file = tmp_path / "watched.json"
-    state = WatchedState(watched_file)
+def test_watched_state_archive_after_reload(fast_tmp_path):
+    """Test archiving keys loaded from file, several per date."""
+    watched_file = fast_tmp_path / "watched.json"
+    old_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    recent_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
-    keys = [NotificationKey("2025-10-01", "Show", "S01E01")]
-    state.mark_watched(keys)
+    WatchedState(watched_file).mark_watched([
+        NotificationKey(old_date, "Show 1", "S01E01"),
+        NotificationKey(old_date, "Show 2", "S01E01"),
+        NotificationKey(recent_date, "Show 1", "S01E02"),
+    ])
 
-    archived = state.archive_old_watched(days=0)
+    state = WatchedState(watched_file)
 
-    assert archived == 0
+    assert state.archive_old_watched(days=7) == 2
     assert state.get_watched_count() == 1
+    assert WatchedState(watched_file).get_watched_count() == 1
 
 
-def test_filter_unwatched_notifications(tmp_path):
-    """Test filtering unwatched notifications."""
-    watched_file = tmp_path / "watched.json"
+def test_watched_state_archive_nothing_expired(fast_tmp_path):
+    """Test that archiving with nothing expired doesn't rewrite the file."""
+    watched_file = fast_tmp_path / "watched.json"
     state = WatchedState(watched_file)
 
+    today = datetime.now().strftime("%Y-%m-%d")
+    state.mark_watched([NotificationKey(today, "Show", "S01E01")])
+    watched_file.unlink()
+
+    assert state.archive_old_watched(days=7) == 0
+    assert not watched_file.exists()
+
+
+def test_watched_state_archive_zero_days(seeded_state):
+    """Test archive with zero days does nothing."""
+    archived = seeded_state.archive_old_watched(days=0)
+
+    assert archived == 0
+    assert seeded_state.get_watched_count() == 1
+
+
+def test_filter_unwatched_notifications(seeded_state):
+    """Test filtering unwatched notifications."""
     notifications = [
-        "2025-11-05 | Show 1 | S01E01 | Episode 1",
+        "2025-11-05 | Show 1 | S01E01 | Episode 1",  # SEEDED_KEY, already watched
         "2025-11-05 | Show 2 | S01E02 | Episode 2",
         "2025-11-05 | Show 3 | S01E03 | Episode 3",
     ]
 
-    # Mark first one as watched
-    key = NotificationKey.from_notification_line(notifications[0])
-    state.mark_watched([key])
-
-    unwatched = filter_unwatched_notifications(notifications, state)
+    unwatched = filter_unwatched_notifications(notifications, seeded_state)
 
     assert len(unwatched) == 2
     assert notifications[1] in unwatched
     assert notifications[2] in unwatched
 
 
-def test_filter_unwatched_handles_invalid_lines(tmp_path):
+def test_filter_unwatched_handles_invalid_lines(empty_state):
     """Test filtering handles invalid notification lines."""
-    watched_file = tmp_path / "watched.json"
-    state = WatchedState(watched_file)
-
     notifications = [
         "2025-11-05 | Show 1 | S01E01 | Episode 1",
         "Invalid line format",
     ]
 
-    unwatched = filter_unwatched_notifications(notifications, state)
+    unwatched = filter_unwatched_notifications(notifications, empty_state)
 
     # Both should be included (invalid lines are kept)
     assert len(unwatched) == 2
 
 
-def test_parse_notification_indices_single():
-    """Test parsing single index."""
-    indices = parse_notification_indices("3", 10)
-
-    assert indices == [2]  # 0-based
-
-
-def test_parse_notification_indices_multiple():
-    """Test parsing multiple indices."""
-    indices = parse_notification_indices("1,3,5", 10)
-
-    assert indices == [0, 2, 4]
-
-
-def test_parse_notification_indices_range():
-    """Test parsing range."""
-    indices = parse_notification_indices("2-4", 10)
-
-    assert indices == [1, 2, 3]
-
-
-def test_parse_notification_indices_mixed():
-    """Test parsing mixed format."""
-    indices = parse_notification_indices("1,3-5,7", 10)
-
-    assert indices == [0, 2, 3, 4, 6]
-
-
-def test_parse_notification_indices_all():
-    """Test parsing 'all'."""
-    indices = parse_notification_indices("all", 5)
-
-    assert indices == [0, 1, 2, 3, 4]
-
-
-def test_parse_notification_indices_none():
-    """Test parsing 'none'."""
-    indices = parse_notification_indices("none", 5)
-
-    assert indices == []
-
-
-def test_parse_notification_indices_empty():
-    """Test parsing empty string."""
-    indices = parse_notification_indices("", 5)
-
-    assert indices == []
-
-
-def test_parse_notification_indices_out_of_range():
-    """Test parsing index out of range."""
-    with pytest.raises(ValueError):
-        parse_notification_indices("10", 5)
-
-
-def test_parse_notification_indices_invalid_range():
-    """Test parsing invalid range."""
+@pytest.mark.parametrize("spec,total,expected", [
+    ("3", 10, [2]),  # 1-based input, 0-based output
+    ("1,3,5", 10, [0, 2, 4]),
+    ("2-4", 10, [1, 2, 3]),
+    ("1,3-5,7", 10, [0, 2, 3, 4, 6]),
+    ("all", 5, [0, 1, 2, 3, 4]),
+    ("none", 5, []),
+    ("", 5, []),
+    ("1,2,1,2", 10, [0, 1]),  # Duplicates removed
+    ("5-6,1-3,2,3-5", 10, [0, 1, 2, 3, 4, 5]),  # Unordered, overlapping ranges
+])
+def test_parse_notification_indices(spec, total, expected):
+    """Test parsing notification selections into sorted unique indices."""
+    assert parse_notification_indices(spec, total) == expected
+
+
+@pytest.mark.parametrize("spec,total", [
+    ("10", 5),  # Out of range
+    ("5-2", 10),  # Reversed range
+])
+def test_parse_notification_indices_invalid(spec, total):
+    """Test that invalid selections raise ValueError."""
     with pytest.raises(ValueError):
-        parse_notification_indices("5-2", 10)
-
-
-def test_parse_notification_indices_removes_duplicates():
-    """Test parsing removes duplicates."""
-    indices = parse_notification_indices("1,2,1,2", 10)
-
-    assert indices == [0, 1]
+        parse_notification_indices(spec, total)